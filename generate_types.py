@@ -1,8 +1,11 @@
 # Requires Python 3.12
 
 import argparse
+import contextlib
+import io
 import sys
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from utils.cli.cli_printing import print_stage_name
@@ -13,11 +16,16 @@ from utils.type_generator import (
     DeclGeneratorTarget,
     DeclFileGeneratorStdoutTarget,
     DeclFileGeneratorDiskTarget,
+    DeclFileGeneratorIncrementalDiskTarget,
     TypeGeneratorRequest,
+    TypeGeneratorSession,
     generate_types,
 )
 from utils.paths import paths
+from utils.profiling.pipeline_profiler import PipelineProfiler
 from utils.utils import jsonc
+from utils.utils.file_utils import sha256_bytes
+from utils.utils.file_watcher import FileWatcher
 
 
 # MARK: Config
@@ -46,12 +54,27 @@ def main() -> int:
         "-c",
         "--config_file",
         type=Path,
-        default=Path("generate_types"),
+        nargs="+",
+        default=[Path("generate_types")],
         help="""
         Path to JSON file containing the configuration for the type generation.
         If no file extension is provided, an attempt is made with extensions
         .json/.jsonc (in that order) in order to locate a valid JSON file.
         If not provided, defaults to 'generate_types'.
+        Multiple config files can be provided, in which case the header file is
+        parsed once and types are generated for each config in turn, or in
+        parallel with --jobs, each to the 'targetPath' of its config.
+        """,
+    )
+    parser.add_argument(
+        "--header_file",
+        type=Path,
+        nargs="+",
+        help=f"""
+        Path to one or more C header files to generate types from. Each header
+        file is preprocessed and parsed as a separate translation unit, in
+        parallel with --jobs, and declarations from all of them are merged.
+        Defaults to 'utils/{FILE_NAME}'.
         """,
     )
     parser.add_argument(
@@ -59,6 +82,14 @@ def main() -> int:
         action="store_true",
         help="Outputs files to stdout instead of file disk.",
     )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="""
+        Deletes the output folder and writes every file again. By default, only
+        files whose contents changed are written, and stale files are removed.
+        """,
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -66,44 +97,292 @@ def main() -> int:
         type=Path,
         help="Path to put generated files on",
     )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="""
+        Disables the persistent caches stored in utils/.temp/cache, forcing the
+        C headers to be processed from scratch.
+        """,
+    )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="""
+        Maximum number of worker processes to use for stages that can run in
+        parallel. Defaults to 1 (no parallelism).
+        """,
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="""
+        Keeps running after generating types, watching the Box2D headers and the
+        config file, and regenerates types whenever they change. Work that only
+        depends on files that did not change is reused between runs.
+        """,
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="REPORT_PATH",
+        help="""
+        Records the wall time, CPU time and peak memory usage of each stage of
+        the generation, and writes them as a JSON report to the given path.
+        """,
+    )
+    parser.add_argument(
+        "--profile_cprofile",
+        action="store_true",
+        help="""
+        Along with --profile, also writes a cProfile dump of each stage to the
+        folder that contains the JSON report.
+        """,
+    )
 
-    input_path = paths.scripts_path(FILE_NAME)
-    if not input_path.exists() or not input_path.is_file():
-        print("Error: Expected path to an existing header file within utils/.")
-        return 1
+    args = parser.parse_args()
 
-    swift_target_path = (
-        args.path
-        if args.path is not None
-        else paths.project_path("Sources", "SwiftBox2D", "Generated")
+    header_paths = (
+        [path.resolve() for path in args.header_file]
+        if args.header_file is not None
+        else [paths.scripts_path(FILE_NAME)]
     )
-    if not swift_target_path.exists() or not swift_target_path.is_dir():
-        print(f"Error: No target directory with name '{swift_target_path}' found.")
+    for header_path in header_paths:
+        if not header_path.exists() or not header_path.is_file():
+            print(f"Error: No header file with name '{header_path}' found.")
+            return 1
+
+    config_paths = [complete_json_path(path) for path in args.config_file]
+    if len(config_paths) > 1 and args.path is not None:
+        print("Error: --output cannot be used with multiple config files.")
         return 1
 
+    for config_path in config_paths:
+        swift_target_path = target_path_for(args, load_config(config_path))
+        if not swift_target_path.exists() or not swift_target_path.is_dir():
+            print(f"Error: No target directory with name '{swift_target_path}' found.")
+            return 1
+
+    if args.watch:
+        return watch(args, header_paths, config_paths)
+
+    return generate_all(args, header_paths, config_paths)
+
+
+def load_config(config_path: Path) -> GeneratorConfig:
+    config_json = jsonc.jsonc_strip_comments(config_path)
+    return GeneratorConfig.from_json_string(config_json)
+
+
+def target_path_for(args: argparse.Namespace, config: GeneratorConfig) -> Path:
+    if args.path is not None:
+        return args.path
+
+    return paths.project_path(config.file_generation.target_path)
+
+
+def profile_path_for(args: argparse.Namespace, config_path: Path) -> Path:
+    if len(args.config_file) == 1:
+        return args.profile
+
+    suffix = config_path.stem
+
+    # Configs that share a file name would otherwise overwrite each other's report
+    if sum(path.stem == config_path.stem for path in args.config_file) > 1:
+        suffix += "-" + sha256_bytes(str(config_path.resolve()).encode())[:12]
+
+    return args.profile.with_stem(f"{args.profile.stem}-{suffix}")
+
+
+def make_request(
+    args: argparse.Namespace,
+    header_paths: list[Path],
+    config_path: Path,
+    parse_only: bool = False,
+) -> TypeGeneratorRequest:
+    """
+    Creates a request to generate types with the config at `config_path`.
+
+    If `parse_only` is `True`, the request is only meant to parse the header
+    files: nothing is printed, the request writes no files and has no profiler.
+    """
+    config = load_config(config_path)
+    if not parse_only:
+        print_stage_name(f"Loaded config from {ConsoleColor.CYAN(config_path)}")
+
+    swift_target_path = target_path_for(args, config)
     target: DeclGeneratorTarget
 
-    if args.stdout:
+    if args.stdout or parse_only:
         target = DeclFileGeneratorStdoutTarget()
-    else:
+    elif args.clean:
         target = DeclFileGeneratorDiskTarget(swift_target_path, rm_folder=True)
-
-    config_path = complete_json_path(args.config_file)
-    config_json = jsonc.jsonc_strip_comments(config_path)
-    config = GeneratorConfig.from_json_string(config_json)
-    print_stage_name(f"Loaded config from {ConsoleColor.CYAN(config_path)}")
+    else:
+        target = DeclFileGeneratorIncrementalDiskTarget(swift_target_path)
 
     request = TypeGeneratorRequest.from_config(
         config=config,
-        header_file=input_path,
+        header_files=header_paths,
         target=target,
         file_header="// Generated by generate_types.py",
     )
     request.extra_compiler_args = ["-I", "../Sources/box2d/include"]
+    request.preprocessed_dir = paths.scripts_path()
+    if not args.no_cache:
+        request.cache_dir = paths.scripts_path(".temp", "cache")
+    request.jobs = max(1, args.jobs)
+    if args.profile is not None and not parse_only:
+        profile_path = profile_path_for(args, config_path)
+        request.profiler = PipelineProfiler(
+            cprofile_dir=(
+                profile_path.parent.joinpath(profile_path.stem)
+                if args.profile_cprofile
+                else None
+            )
+        )
+
+    return request
+
+
+def write_profile_report(
+    args: argparse.Namespace, request: TypeGeneratorRequest, config_path: Path
+):
+    if request.profiler is None:
+        return
+
+    profile_path = profile_path_for(args, config_path)
+    request.profiler.write_report(profile_path)
+    print_stage_name(f"Wrote profile report to {ConsoleColor.CYAN(profile_path)}")
+
+
+def generate_all(
+    args: argparse.Namespace,
+    header_paths: list[Path],
+    config_paths: list[Path],
+    session: TypeGeneratorSession | None = None,
+) -> int:
+    """
+    Generates types for each config in `config_paths`, parsing the header file
+    only once. Configs are processed in parallel if `--jobs` allows it.
+    """
+    if session is None:
+        session = TypeGeneratorSession()
+
+    if len(config_paths) > 1 and args.jobs > 1 and not args.stdout:
+        return _generate_all_parallel(args, header_paths, config_paths, session)
+
+    result = 0
+    for config_path in config_paths:
+        request = make_request(args, header_paths, config_path)
+        result = generate_types(request, session) or result
+        write_profile_report(args, request, config_path)
+
+    return result
+
+
+def _generate_all_parallel(
+    args: argparse.Namespace,
+    header_paths: list[Path],
+    config_paths: list[Path],
+    session: TypeGeneratorSession,
+) -> int:
+    # Parse the header file once up-front, and share it with all workers
+    request = make_request(args, header_paths, config_paths[0], parse_only=True)
+
+    profiler = PipelineProfiler() if args.profile is not None else None
+    session.load_asts(request, profiler)
+
+    # Workers reuse the parsed header file, so parsing is reported separately
+    if profiler is not None:
+        profile_path = args.profile.with_stem(f"{args.profile.stem}-parse")
+        profiler.write_report(profile_path)
+        print_stage_name(f"Wrote profile report to {ConsoleColor.CYAN(profile_path)}")
+
+    workers = min(args.jobs, len(config_paths))
+    print_stage_name(
+        f"Generating types for {ConsoleColor.CYAN(len(config_paths))} configs with {ConsoleColor.CYAN(workers)} worker(s)..."
+    )
+
+    result = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args, header_paths, session),
+    ) as executor:
+        for worker_result, output in executor.map(_generate_in_worker, config_paths):
+            print(output, end="")
+            result = worker_result or result
+
+    return result
+
+
+_worker_state: tuple[argparse.Namespace, list[Path], TypeGeneratorSession]
+
+
+def _init_worker(
+    args: argparse.Namespace,
+    header_paths: list[Path],
+    session: TypeGeneratorSession,
+):
+    global _worker_state
+
+    # Configs are already being processed in parallel
+    args.jobs = 1
+    _worker_state = (args, header_paths, session)
+
+
+def _generate_in_worker(config_path: Path) -> tuple[int, str]:
+    args, header_paths, session = _worker_state
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        request = make_request(args, header_paths, config_path)
+        result = generate_types(request, session)
+        write_profile_report(args, request, config_path)
+
+    return result, output.getvalue()
+
+
+def watch(
+    args: argparse.Namespace, header_paths: list[Path], config_paths: list[Path]
+) -> int:
+    """
+    Generates types, then keeps regenerating them whenever the Box2D headers or
+    the config files change, until interrupted.
+    """
+    resolved_config_paths = {path.resolve() for path in config_paths}
+
+    watcher = FileWatcher(
+        paths=[*header_paths, *config_paths],
+        globs=[(paths.project_path("Sources", "box2d", "include", "box2d"), "*.h")],
+    )
+    session = TypeGeneratorSession()
+
+    def run():
+        try:
+            generate_all(args, header_paths, config_paths, session)
+        except Exception as error:
+            # Keep watching; the error is likely fixed by a subsequent edit.
+            print(f"{ConsoleColor.RED('ERROR')}: {error}")
+
+    run()
+
+    while True:
+        print_stage_name(
+            f"Watching {ConsoleColor.CYAN(len(watcher.watched_files()))} file(s) for changes... (Ctrl+C to stop)"
+        )
+        changed = watcher.wait_for_changes()
+
+        for path in sorted(changed):
+            print(f"  > Changed: {ConsoleColor.MAGENTA(path)}")
+
+        if changed_headers := changed - resolved_config_paths:
+            session.invalidate_headers(changed_headers)
 
-    generate_types(request)
+        run()
 
 
 if __name__ == "__main__":
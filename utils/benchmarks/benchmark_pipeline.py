@@ -0,0 +1,285 @@
+# Benchmarks each stage of the type generation pipeline against synthetic
+# Box2D-style headers of increasing sizes.
+#
+# Usage:
+#
+#     python utils/benchmarks/benchmark_pipeline.py --output benchmark.json
+#     python utils/benchmarks/benchmark_pipeline.py --sizes 1000 10000 --repeat 5
+#
+# Results are written as JSON, with the timings of every run of every stage, and
+# a per-stage summary (minimum and median wall/CPU times) for each header size.
+
+if __name__ == "__main__":
+    import sys
+    import pathlib
+
+    sys.path.insert(0, str(pathlib.Path(__file__).joinpath("../../../").resolve()))
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from utils.benchmarks.synthetic_header import (
+    SyntheticHeader,
+    generate_synthetic_header,
+)
+from utils.cli.console_color import ConsoleColor
+from utils.data.generator_config import GeneratorConfig
+from utils.profiling.pipeline_profiler import PipelineProfiler
+from utils.type_generator import (
+    DeclFileGeneratorDiskTarget,
+    TypeGeneratorRequest,
+    generate_types,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def make_config(header: SyntheticHeader, target_path: Path) -> GeneratorConfig:
+    """
+    Returns a generator configuration mirroring generate_types.jsonc, adjusted
+    to the declarations of a synthetic header.
+    """
+    return GeneratorConfig.from_json(
+        {
+            "declarations": {
+                "prefixes": ["b2_", "b2"],
+                "symbolCasing": {
+                    "enums": "camelCase",
+                    "enumMembers": "mixed_Case",
+                    "structs": "camelCase",
+                    "functions": "camelCase",
+                },
+                "swiftSymbolFormatting": {
+                    "symbolCasing": {
+                        "enums": "PascalCase",
+                        "enumMembers": "camelCase",
+                        "structs": "PascalCase",
+                        "functions": "camelCase",
+                    },
+                    "capitalizeTerms": ["AABB"],
+                    "patternsToSplit": [],
+                    "snakeCaseAfterTerms": [],
+                },
+                "autoProperty": True,
+                "functionsToMethods": header.function_to_method_mappers(),
+                "conformances": [
+                    {
+                        "cName": f"b2{family}Id",
+                        "conformances": ["Equatable", "Hashable"],
+                    }
+                    for family in header.families
+                ],
+                "filters": {
+                    "enums": ["."],
+                    "enumMembers": ["."],
+                    "structs": ["."],
+                    "methods": ["."],
+                },
+            },
+            "docComments": {"collect": True, "format": True},
+            "fileGeneration": {
+                "targetPath": str(target_path),
+                "globalFileSuffix": "+Ext",
+                "imports": ["box2d"],
+                "directoryStructure": [
+                    {"path": "Joints", "match": ["/B2(\\w+)Joint.+/"]},
+                ],
+            },
+        }
+    )
+
+
+def run_once(
+    header: SyntheticHeader,
+    work_dir: Path,
+    trace_memory: bool,
+    jobs: int,
+) -> PipelineProfiler:
+    """Runs the whole pipeline once over a synthetic header, returning its profile."""
+    header_path = work_dir.joinpath("synthetic.h")
+    header_path.write_text(header.source, newline="\n")
+
+    target_path = work_dir.joinpath("Generated")
+    target_path.mkdir(exist_ok=True)
+
+    config = make_config(header, target_path)
+    target = DeclFileGeneratorDiskTarget(target_path, rm_folder=True, verbose=False)
+
+    request = TypeGeneratorRequest.from_config(
+        config=config,
+        header_files=[header_path],
+        target=target,
+        file_header="// Generated by benchmark_pipeline.py",
+    )
+    request.jobs = jobs
+    request.profiler = PipelineProfiler(trace_memory=trace_memory)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = generate_types(request)
+
+    if result != 0:
+        raise RuntimeError(f"Pipeline failed with exit code {result}")
+
+    return request.profiler
+
+
+def summarize(profiles: list[PipelineProfiler]) -> dict:
+    """Returns the minimum and median wall/CPU time of each stage across `profiles`."""
+    wall_times: dict[str, list[int]] = {}
+    cpu_times: dict[str, list[int]] = {}
+
+    for profile in profiles:
+        for stage in profile.stages:
+            wall_times.setdefault(stage.name, []).append(stage.wall_time_ns)
+            cpu_times.setdefault(stage.name, []).append(stage.cpu_time_ns)
+
+    totals = [profile.total_wall_time_ns() for profile in profiles]
+
+    return {
+        "stages": {
+            name: {
+                "min_wall_time_ns": min(wall_times[name]),
+                "median_wall_time_ns": int(statistics.median(wall_times[name])),
+                "min_cpu_time_ns": min(cpu_times[name]),
+                "median_cpu_time_ns": int(statistics.median(cpu_times[name])),
+            }
+            for name in wall_times
+        },
+        "min_total_wall_time_ns": min(totals),
+        "median_total_wall_time_ns": int(statistics.median(totals)),
+    }
+
+
+def benchmark_size(
+    size: int, repeat: int, trace_memory: bool, jobs: int, keep_dir: Path | None
+) -> dict:
+    header = generate_synthetic_header(size)
+
+    profiles: list[PipelineProfiler] = []
+
+    for _ in range(repeat):
+        if keep_dir is not None:
+            work_dir = keep_dir.joinpath(str(size))
+            work_dir.mkdir(parents=True, exist_ok=True)
+            profiles.append(run_once(header, work_dir, trace_memory, jobs))
+            continue
+
+        with tempfile.TemporaryDirectory(prefix="swiftbox2d-bench-") as temp_dir:
+            profiles.append(run_once(header, Path(temp_dir), trace_memory, jobs))
+
+    return {
+        "size": size,
+        "num_decls": header.num_decls,
+        "header_bytes": len(header.source.encode()),
+        "summary": summarize(profiles),
+        "runs": [profile.to_json() for profile in profiles],
+    }
+
+
+def make_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="""
+        Benchmarks each stage of the type generation pipeline against synthetic
+        Box2D-style headers with a given number of declarations.
+        """
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help=f"Number of declarations of each synthetic header. Defaults to {' '.join(map(str, DEFAULT_SIZES))}.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times to run the pipeline for each size. Defaults to 3.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Maximum number of worker processes the pipeline may use.",
+    )
+    parser.add_argument(
+        "--trace_memory",
+        action="store_true",
+        help="Also records the peak memory usage of each stage. Slows down every stage considerably.",
+    )
+    parser.add_argument(
+        "--keep_dir",
+        type=Path,
+        help="Folder to keep the synthetic headers and generated files in, instead of a temporary folder.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="Path of the JSON file to write results to. Results are printed to stdout if not provided.",
+    )
+
+    return parser
+
+
+def main() -> int:
+    args = make_argparser().parse_args()
+
+    results = []
+
+    for size in args.sizes:
+        print(
+            f"{ConsoleColor.YELLOW('•')} Benchmarking {ConsoleColor.CYAN(size)} declarations ({args.repeat} run(s))...",
+            file=sys.stderr,
+        )
+
+        result = benchmark_size(
+            size,
+            repeat=max(1, args.repeat),
+            trace_memory=args.trace_memory,
+            jobs=max(1, args.jobs),
+            keep_dir=args.keep_dir,
+        )
+        results.append(result)
+
+        for name, stage in result["summary"]["stages"].items():
+            print(
+                f"  > {name}: {stage['median_wall_time_ns'] / 1_000_000:0.1f}ms median wall",
+                file=sys.stderr,
+            )
+
+    report = {
+        "python": sys.version,
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "jobs": args.jobs,
+        "trace_memory": args.trace_memory,
+        "results": results,
+    }
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", newline="\n") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        sys.exit(1)
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from io import StringIO
+
+FAMILY_NAMES: list[str] = [
+    "World",
+    "Body",
+    "Shape",
+    "Chain",
+    "Joint",
+    "DistanceJoint",
+    "MotorJoint",
+    "MouseJoint",
+    "PrismaticJoint",
+    "RevoluteJoint",
+    "WeldJoint",
+    "WheelJoint",
+]
+"""
+Names of the handle types that functions are grouped under, matching the
+`b2<Family>_` function prefixes of the Box2D API.
+"""
+
+_FIELD_TYPES: list[str] = ["float", "int", "_Bool", "double", "unsigned short"]
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticHeader:
+    """A generated Box2D-style C header, along with what it declares."""
+
+    source: str
+    "Contents of the header file."
+
+    num_decls: int
+    "Number of enum, struct and function declarations in the header."
+
+    families: list[str]
+    "Names of the `b2<Family>Id` handle types functions are grouped under."
+
+    def function_to_method_mappers(self) -> list[dict]:
+        """
+        Returns `functionsToMethods` configuration entries that map the
+        functions of each family to methods of its Swift handle type.
+        """
+        return [
+            {
+                "cPrefix": f"b2{family}_",
+                "swiftType": f"B2{family}",
+                "param0": {"swiftName": "id", "type": f"b2{family}Id"},
+            }
+            for family in self.families
+        ]
+
+
+def generate_synthetic_header(num_decls: int) -> SyntheticHeader:
+    """
+    Generates a self-contained C header with approximately `num_decls` doc-
+    commented declarations, following the style of the Box2D public headers:
+
+    - one-in-ten declarations is a `typedef enum b2...`;
+    - two-in-ten declarations are `typedef struct b2...Def` with a handful of
+    fields;
+    - the remaining declarations are getter/setter function pairs of the form
+    `b2<Family>_GetX`/`b2<Family>_SetX`, taking a `b2<Family>Id` handle as
+    their first parameter.
+
+    Only builtin C types are used, so the header can be preprocessed without
+    any include paths.
+    """
+    num_enums = num_decls // 10
+    num_structs = num_decls // 5
+    num_functions = max(0, num_decls - num_enums - num_structs - len(FAMILY_NAMES))
+
+    out = StringIO()
+    out.write("// Synthetic Box2D-style header generated for benchmarking.\n\n")
+
+    for family in FAMILY_NAMES:
+        out.write(f"/// {family} id references a {family.lower()} instance.\n")
+        out.write(f"typedef struct b2{family}Id\n{{\n")
+        out.write("\tint index1;\n\tunsigned short world0;\n")
+        out.write(f"\tunsigned short generation;\n}} b2{family}Id;\n\n")
+
+    for index in range(num_enums):
+        name = f"b2SyntheticType{index}"
+        out.write(f"/// Describes the kinds of synthetic objects of group {index}.\n")
+        out.write(f"/// @see b2SyntheticDef{index}\n")
+        out.write(f"typedef enum {name}\n{{\n")
+        for member in range(4):
+            out.write(f"\t/// Member {member} of `{name}`\n")
+            out.write(f"\tb2_synthetic{index}Member{member},\n")
+        out.write(f"\tb2_synthetic{index}Count\n}} {name};\n\n")
+
+    for index in range(num_structs):
+        name = f"b2SyntheticDef{index}"
+        out.write(f"/// Used to create a synthetic object of group {index}.\n")
+        out.write(f"/// Must be initialized using `b2DefaultSyntheticDef{index}()`.\n")
+        out.write(f"typedef struct {name}\n{{\n")
+        for field in range(4):
+            field_type = _FIELD_TYPES[(index + field) % len(_FIELD_TYPES)]
+            out.write(f"\t/// Field {field} of the definition, in meters\n")
+            out.write(f"\t{field_type} field{field};\n")
+        if index > 0 and index % 3 == 0:
+            out.write("\t/// The definition this one is based on\n")
+            out.write(f"\tb2SyntheticDef{index - 1} base;\n")
+        out.write(f"}} {name};\n\n")
+
+    for index in range(num_functions):
+        family = FAMILY_NAMES[(index // 2) % len(FAMILY_NAMES)]
+        value_type = _FIELD_TYPES[(index // 2) % len(_FIELD_TYPES)]
+        prop = f"Property{index // 2}"
+        id_param = f"b2{family}Id {family[0].lower()}{family[1:]}Id"
+
+        if index % 2 == 0:
+            out.write(f"/// Get the {prop.lower()} of a {family.lower()}.\n")
+            out.write(f"/// @return The current value of `b2{family}_Set{prop}`\n")
+            out.write(f"{value_type} b2{family}_Get{prop}( {id_param} );\n\n")
+        else:
+            out.write(f"/// Set the {prop.lower()} of a {family.lower()}.\n")
+            out.write("/// @param value The new value\n")
+            out.write(
+                f"void b2{family}_Set{prop}( {id_param}, {value_type} value );\n\n"
+            )
+
+    return SyntheticHeader(
+        source=out.getvalue(),
+        num_decls=len(FAMILY_NAMES) + num_enums + num_structs + num_functions,
+        families=list(FAMILY_NAMES),
+    )
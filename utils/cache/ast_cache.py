@@ -0,0 +1,119 @@
+import io
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import pycparser
+from pycparser import c_ast, c_parser
+
+from utils.utils.file_utils import sha256_bytes, write_bytes_atomic
+
+
+class AstCache:
+    """
+    A persistent cache of parsed pycparser ASTs.
+
+    Snapshots are keyed by the contents of the preprocessed source, the name of
+    the file it was parsed from, and the versions of pycparser and Python that
+    produced them. Snapshots that fail to load are treated as cache misses.
+    """
+
+    cache_dir: Path
+    "Directory where cache entries are stored."
+
+    max_entries: int
+    "Maximum number of snapshots to keep on disk; the least recently used snapshots are removed when storing new ones."
+
+    def __init__(self, cache_dir: Path, max_entries: int = 4):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def fetch(self, source: bytes, file_name: Path) -> c_ast.FileAST | None:
+        """Returns the cached AST for a given preprocessed source, if one is available."""
+        entry_path = self._entry_path(source, file_name)
+
+        try:
+            with open(entry_path, "rb") as file:
+                ast = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible snapshot
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        if not isinstance(ast, c_ast.FileAST):
+            return None
+
+        # Mark the snapshot as recently used, so pruning evicts the least
+        # recently used snapshots first
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        return ast
+
+    def store(self, source: bytes, file_name: Path, ast: c_ast.FileAST):
+        """Stores a snapshot of the AST that was parsed from a given preprocessed source."""
+        entry_path = self._entry_path(source, file_name)
+
+        write_bytes_atomic(
+            entry_path, pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+        self._prune(keep=entry_path)
+
+    def _entry_path(self, source: bytes, file_name: Path) -> Path:
+        key = sha256_bytes(
+            b"\0".join(
+                [
+                    source,
+                    str(file_name).encode(),
+                    pycparser.__version__.encode(),
+                    sys.version.encode(),
+                ]
+            )
+        )
+
+        return self.cache_dir.joinpath("ast", f"{key}.pickle")
+
+    def _prune(self, keep: Path):
+        def mtime(path: Path) -> int:
+            try:
+                return path.stat().st_mtime_ns
+            except OSError:
+                return 0
+
+        entries = sorted(
+            self.cache_dir.joinpath("ast").glob("*.pickle"), key=mtime, reverse=True
+        )
+
+        for entry in entries[self.max_entries :]:
+            if entry != keep:
+                entry.unlink(missing_ok=True)
+
+
+def parse_file_cached(
+    path: Path, source: bytes, cache: AstCache | None
+) -> c_ast.FileAST:
+    """
+    Parses a preprocessed C source with pycparser, reusing a cached AST snapshot
+    of the same source, if available.
+
+    `source` is parsed from memory, as if read from the file at `path`, so the
+    AST always matches the source it is cached under, even if the file at `path`
+    is overwritten concurrently.
+    """
+    if cache is not None and (ast := cache.fetch(source, path)) is not None:
+        return ast
+
+    # Decoded the same way `pycparser.parse_file()` reads files
+    text = io.TextIOWrapper(io.BytesIO(source)).read()
+    ast = c_parser.CParser().parse(text, str(path))
+
+    if cache is not None:
+        cache.store(source, path, ast)
+
+    return ast
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from utils.cache.file_fingerprint import FileFingerprint
+from utils.doccomment.doccomment_block import DoccommentBlock
+from utils.utils.file_utils import sha256_bytes, write_bytes_atomic
+
+
+class DoccommentIndexCache:
+    """
+    A persistent cache of the doc comments found in each header file.
+
+    Entries are keyed by the path of the header file and the doc comment
+    patterns that were searched for, and are only reused while the header file
+    still has the same contents.
+
+    Each entry stores a table of `(line, column, contents)` rows, one for each
+    doc comment block, in file order; the line -> block map of the file is
+    derived from the line and line count of each block when loaded.
+    """
+
+    cache_dir: Path
+    "Directory where cache entries are stored."
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def fetch(self, path: Path, patterns: list[str]) -> list[DoccommentBlock] | None:
+        """
+        Returns the doc comments of the file at `path`, or `None`, if no valid
+        entry exists.
+        """
+        try:
+            with open(self._entry_path(path, patterns), "rb") as file:
+                entry = json.load(file)
+
+            fingerprint = FileFingerprint.from_json(entry["file"])
+            rows: list[list] = entry["blocks"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if not fingerprint.is_up_to_date():
+            return None
+
+        return [
+            DoccommentBlock(
+                file=path,
+                line=line,
+                column=column,
+                comment_contents=contents,
+                line_count=contents.count("\n") + 1,
+            )
+            for line, column, contents in rows
+        ]
+
+    def store(
+        self,
+        path: Path,
+        patterns: list[str],
+        fingerprint: FileFingerprint,
+        blocks: list[DoccommentBlock],
+    ):
+        """
+        Stores the doc comments found in a file. `fingerprint` should be taken
+        before the file was read, so changes made while reading it invalidate
+        the entry.
+        """
+        entry = {
+            "file": fingerprint.to_json(),
+            "patterns": patterns,
+            "blocks": [
+                [block.line, block.column, block.comment_contents] for block in blocks
+            ],
+        }
+
+        write_bytes_atomic(
+            self._entry_path(path, patterns),
+            json.dumps(entry, separators=(",", ":")).encode(),
+        )
+
+    def _entry_path(self, path: Path, patterns: list[str]) -> Path:
+        key = sha256_bytes(json.dumps([str(path.resolve()), patterns]).encode())
+
+        return self.cache_dir.joinpath("doccomments", f"{key}.json")
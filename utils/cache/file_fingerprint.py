@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+from utils.utils.file_utils import sha256_file
+
+
+@dataclass(frozen=True, slots=True)
+class FileFingerprint:
+    """
+    Identifies the contents of a file on disk at the time it was recorded, used
+    to validate cache entries derived from that file.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def from_path(cls, path: Path) -> "FileFingerprint":
+        stat = path.stat()
+        return cls(
+            path=str(path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=sha256_file(path),
+        )
+
+    def is_up_to_date(self) -> bool:
+        """
+        Returns `True` if the file on disk still matches this fingerprint. File
+        sizes and modification times are checked first, with content hashes
+        being used only when those differ.
+        """
+        path = Path(self.path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+
+        if stat.st_size != self.size:
+            return False
+        if stat.st_mtime_ns == self.mtime_ns:
+            return True
+
+        return sha256_file(path) == self.sha256
+
+    def to_json(self) -> list:
+        return [self.path, self.size, self.mtime_ns, self.sha256]
+
+    @classmethod
+    def from_json(cls, json: list) -> "FileFingerprint":
+        path, size, mtime_ns, sha256 = json
+        return cls(path=path, size=size, mtime_ns=mtime_ns, sha256=sha256)
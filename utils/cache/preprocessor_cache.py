@@ -0,0 +1,142 @@
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Sequence
+
+from utils.cache.file_fingerprint import FileFingerprint
+from utils.utils.file_utils import sha256_bytes, write_bytes_atomic
+
+# Matches line markers emitted by clang/gcc (`# 1 "file.h"`) and cl/clang with
+# `-fuse-line-directives` (`#line 1 "file.h"`).
+_line_marker_regex = re.compile(
+    rb'^#(?:line)?[ \t]+\d+[ \t]+"((?:[^"\\]|\\.)*)"', re.MULTILINE
+)
+
+
+class PreprocessorCache:
+    """
+    A persistent cache for the output of the C preprocessor.
+
+    Entries are keyed by the compiler invocation (arguments, working directory
+    and compiler executable), and are only reused while every header that was
+    included when producing them, as recorded by the line markers in the
+    output, still has the same contents.
+    """
+
+    cache_dir: Path
+    "Directory where cache entries are stored."
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def fetch(self, args: Sequence[str | os.PathLike], cwd: Path) -> bytes | None:
+        """
+        Returns the cached preprocessor output for a given compiler invocation,
+        or `None`, if no valid entry exists.
+        """
+        if (key := self._entry_key(args, cwd)) is None:
+            return None
+
+        manifest_path, output_path = self._entry_paths(key)
+
+        try:
+            with open(manifest_path, "rb") as file:
+                manifest = json.load(file)
+
+            dependencies = [
+                FileFingerprint.from_json(d) for d in manifest["dependencies"]
+            ]
+            output_hash: str = manifest["output_sha256"]
+
+            with open(output_path, "rb") as file:
+                output = file.read()
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if sha256_bytes(output) != output_hash:
+            return None
+        if not all(dep.is_up_to_date() for dep in dependencies):
+            return None
+
+        return output
+
+    def store(self, args: Sequence[str | os.PathLike], cwd: Path, output: bytes):
+        """Stores the output of a compiler invocation into the cache."""
+        if (key := self._entry_key(args, cwd)) is None:
+            return
+
+        dependencies = [
+            FileFingerprint.from_path(path) for path in _included_files(output, cwd)
+        ]
+        manifest = {
+            "args": [str(arg) for arg in args],
+            "output_sha256": sha256_bytes(output),
+            "dependencies": [dep.to_json() for dep in dependencies],
+        }
+
+        manifest_path, output_path = self._entry_paths(key)
+
+        write_bytes_atomic(output_path, output)
+        write_bytes_atomic(manifest_path, json.dumps(manifest, indent=1).encode())
+
+    def _entry_paths(self, key: str) -> tuple[Path, Path]:
+        folder = self.cache_dir.joinpath("preprocessor")
+        return folder.joinpath(f"{key}.json"), folder.joinpath(f"{key}.i")
+
+    def _entry_key(self, args: Sequence[str | os.PathLike], cwd: Path) -> str | None:
+        compiler = _compiler_identity(str(args[0]))
+        if compiler is None:
+            return None
+
+        key = json.dumps(
+            {
+                "args": [str(arg) for arg in args],
+                "cwd": str(cwd.resolve()),
+                "compiler": compiler,
+            }
+        )
+
+        return sha256_bytes(key.encode())
+
+
+def _compiler_identity(compiler: str) -> list | None:
+    """
+    Returns a value that identifies the compiler executable that will be invoked
+    for a given command name, changing whenever the compiler is replaced or
+    upgraded, without having to spawn it to query its version.
+    """
+    if (executable := shutil.which(compiler)) is None:
+        return None
+
+    path = Path(executable).resolve()
+    stat = path.stat()
+
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _included_files(output: bytes, cwd: Path) -> list[Path]:
+    """
+    Returns the files that contributed to a given preprocessor output, in the
+    order they were first referenced, by inspecting its line markers.
+    """
+    result: dict[Path, None] = dict()
+
+    for match in _line_marker_regex.finditer(output):
+        name = match.group(1).decode(errors="replace")
+
+        # Skip pseudo-files such as <built-in> and <command line>
+        if name.startswith("<") and name.endswith(">"):
+            continue
+
+        # cl escapes backslashes in #line directives
+        name = name.replace("\\\\", "\\")
+
+        path = cwd.joinpath(name)
+        if path in result or not path.is_file():
+            continue
+
+        result[path] = None
+
+    return list(result)
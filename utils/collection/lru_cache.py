@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A mapping bounded to a maximum number of entries, evicting the least
+    recently used entries first once full.
+
+    A `max_size` of `0` disables caching, and `None` removes the bound.
+    """
+
+    max_size: int | None
+    "Maximum number of entries kept in this cache."
+
+    hits: int
+    "Number of lookups that found a cached value."
+
+    misses: int
+    "Number of lookups that did not find a cached value."
+
+    _entries: OrderedDict[K, V]
+
+    def __init__(self, max_size: int | None):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> V | None:
+        """Returns the value cached for `key`, marking it as recently used, or `None`, if not cached."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def put(self, key: K, value: V):
+        """Caches `value` for `key`, evicting the least recently used entry if the cache is full."""
+        if self.max_size == 0:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
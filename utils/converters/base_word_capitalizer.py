@@ -1,4 +1,5 @@
 import re
+from typing import Iterable
 
 
 class BaseWordCapitalizer:
@@ -62,6 +63,109 @@ class WordCapitalizer(BaseWordCapitalizer):
         return None
 
 
+class WordListCapitalizer(BaseWordCapitalizer):
+    """
+    Capitalizes the earliest occurrence of any word from a list of words as a
+    substring of an input string, searching for every word at once.
+
+    Suggestions are the same as the leftmost suggestion of a `WordCapitalizer`
+    for each word, with words that appear earlier in the list taking precedence
+    over words that match at the same index.
+
+    Words are limited to ASCII letters, digits and underscores; see `can_merge()`.
+    """
+
+    words: list[str]
+
+    word_patterns: list[re.Pattern]
+    "Pattern of each word, as used by `WordCapitalizer`."
+
+    pattern: re.Pattern
+    "Matches any of the words, with common prefixes factored out, to find the leftmost match in a single scan."
+
+    words_by_initial: dict[str, list[int]]
+    "Indices of the words that start with each lower-cased character, in list order."
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words = list(words)
+        self.word_patterns = [
+            re.compile(f"({word})", flags=re.IGNORECASE) for word in self.words
+        ]
+        self.pattern = re.compile(
+            _trie_pattern(word.lower() for word in self.words), flags=re.IGNORECASE
+        )
+
+        self.words_by_initial = dict()
+        for index, word in enumerate(self.words):
+            self.words_by_initial.setdefault(word[0].lower(), []).append(index)
+
+    @staticmethod
+    def can_merge(capitalizer: "BaseWordCapitalizer") -> bool:
+        """
+        Returns whether `capitalizer` is a `WordCapitalizer` of a word made only
+        of ASCII letters, digits and underscores, which are matched literally.
+        """
+        return isinstance(capitalizer, WordCapitalizer) and (
+            _ascii_word_regex.fullmatch(capitalizer.word) is not None
+        )
+
+    @classmethod
+    def merging(
+        cls, capitalizers: Iterable[BaseWordCapitalizer]
+    ) -> list[BaseWordCapitalizer]:
+        """
+        Returns `capitalizers` with every run of consecutive word capitalizers
+        that `can_merge()` replaced with a `WordListCapitalizer` that suggests
+        the same capitalizations as the run.
+        """
+        result: list[BaseWordCapitalizer] = []
+        run: list[WordCapitalizer] = []
+
+        def close_run():
+            if len(run) == 1:
+                result.append(run[0])
+            elif len(run) > 1:
+                result.append(cls(word.word for word in run))
+
+            run.clear()
+
+        for capitalizer in capitalizers:
+            if isinstance(capitalizer, WordCapitalizer) and cls.can_merge(capitalizer):
+                run.append(capitalizer)
+            else:
+                close_run()
+                result.append(capitalizer)
+
+        close_run()
+
+        return result
+
+    def suggest_capitalization(
+        self, string: str, has_leading_string: bool
+    ) -> tuple[str, int, int] | None:
+        if (match := self.pattern.search(string)) is None:
+            return None
+
+        start = match.start()
+
+        # Non-ASCII characters may match ASCII ones when ignoring case
+        initial = string[start]
+        if initial.isascii():
+            candidates: Iterable[int] = self.words_by_initial.get(initial.lower(), [])
+        else:
+            candidates = range(len(self.words))
+
+        for index in candidates:
+            if word_match := self.word_patterns[index].match(string, start):
+                return (
+                    word_match.group(1).upper(),
+                    word_match.start(1),
+                    word_match.end(1),
+                )
+
+        return None
+
+
 class PatternCapitalizer(BaseWordCapitalizer):
     """
     Capitalizes a word in a string using a regex matcher that will capitalize the
@@ -110,3 +214,34 @@ class PatternCapitalizer(BaseWordCapitalizer):
                 break
 
         return leftmost_interval
+
+
+_ascii_word_regex = re.compile(r"\w+", flags=re.ASCII)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Returns a regex pattern that matches any of the given words, with common
+    prefixes factored out, e.g. `["ab", "abc", "ad"]` -> `a(?:b(?:c)?|d)`.
+    """
+    trie: dict = dict()
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, dict())
+        node[""] = dict()
+
+    def pattern(node: dict) -> str:
+        branches = [
+            re.escape(char) + pattern(child) for char, child in node.items() if char
+        ]
+        if len(branches) == 0:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            body = f"(?:{body})?"
+
+        return body
+
+    return pattern(trie)
@@ -1,7 +1,11 @@
 import re
-from typing import Iterable, Tuple
+from typing import Iterable, Iterator, Tuple
 
-from utils.converters.base_word_capitalizer import BaseWordCapitalizer
+from utils.collection.lru_cache import LRUCache
+from utils.converters.base_word_capitalizer import (
+    BaseWordCapitalizer,
+    WordListCapitalizer,
+)
 from utils.data.c_decl_kind import CDeclKind
 from utils.data.compound_symbol_name import ComponentCase, CompoundSymbolName
 from utils.data.generator_config import GeneratorConfig
@@ -23,6 +27,12 @@ class SymbolNameFormatter:
     entry that matches earliest in the string is chosen.
     """
 
+    _merged_capitalizers: list[BaseWordCapitalizer]
+    """
+    `capitalizers`, with consecutive word capitalizers merged so they search a
+    component once, instead of once per word.
+    """
+
     # TODO: Figure out a better way to automatically recognize joined symbol name.
     words_to_split: list[re.Pattern]
     """
@@ -31,9 +41,20 @@ class SymbolNameFormatter:
     would be an entry like:
     `re.compile(r"(Color)(Management)", flags=re.IGNORECASE)`
 
-    - NOTE: Regex are applied recursively to split segments, so a simple regex that has a single capture group will lead to recursion errors.
+    - NOTE: Regex are applied repeatedly to split segments; segments that would
+    be split into parts that include the segment itself are kept as-is.
+    """
+
+    _split_prefilter: re.Pattern | None
+    """
+    Matches wherever any pattern in `words_to_split` matches, to skip trying each
+    pattern on segments that match none, or `None` if the patterns cannot be
+    combined.
     """
 
+    _split_cache: LRUCache[str, tuple[str, ...]]
+    "Segments that each string was split into by `words_to_split`."
+
     terms_to_snake_case_after: list[str]
     """
     List of camelCase terms to detect and split into a trailing snake_case.
@@ -59,8 +80,11 @@ class SymbolNameFormatter:
 
         self.symbol_case_settings = symbol_case_settings
         self.capitalizers = list(capitalizers)
+        self._merged_capitalizers = WordListCapitalizer.merging(self.capitalizers)
         self.words_to_split = list(words_to_split)
         self.terms_to_snake_case_after = list(terms_to_snake_case_after)
+        self._split_prefilter = _combined_pattern(self.words_to_split)
+        self._split_cache = LRUCache(4096)
 
     @classmethod
     def from_config(cls, config: GeneratorConfig.Declarations.SwiftNameFormatting):
@@ -163,7 +187,62 @@ class SymbolNameFormatter:
         )
 
     def split_component_inplace(self, string: str, output: list[str]):
-        """Performs recursive in-place splitting of `string` along `self.words_to_split` boundaries into `output`."""
+        """Performs in-place splitting of `string` along `self.words_to_split` boundaries into `output`."""
+        output.extend(self._split_segments(string))
+
+    def _split_segments(self, string: str) -> tuple[str, ...]:
+        """
+        Splits `string` along `self.words_to_split` boundaries, splitting each
+        resulting segment again until no pattern splits it further.
+
+        Segments are expanded with an explicit worklist instead of recursion, and
+        a segment that is split into parts that include itself, directly or
+        through its parts, is kept as-is instead of being expanded again.
+        """
+        result: list[str] = []
+        expanding: set[str] = set()
+        # Segments being expanded, the parts left to expand, and their output
+        frames: list[tuple[str, Iterator[str], list[str]]] = []
+
+        def push(segment: str, output: list[str]):
+            if (cached := self._split_cache.get(segment)) is not None:
+                output.extend(cached)
+                return
+
+            if segment in expanding or (parts := self._split_once(segment)) is None:
+                output.append(segment)
+                return
+
+            expanding.add(segment)
+            frames.append((segment, iter(parts), []))
+
+        push(string, result)
+
+        while len(frames) > 0:
+            segment, parts, output = frames[-1]
+
+            if (part := next(parts, None)) is not None:
+                push(part, output)
+                continue
+
+            frames.pop()
+            expanding.remove(segment)
+            self._split_cache.put(segment, tuple(output))
+
+            (frames[-1][2] if len(frames) > 0 else result).extend(output)
+
+        return tuple(result)
+
+    def _split_once(self, string: str) -> list[str] | None:
+        """
+        Splits `string` with the first pattern in `self.words_to_split` that
+        matches it, returning the non-empty parts, or `None` if no pattern splits
+        `string`.
+        """
+        if self._split_prefilter is not None and not self._split_prefilter.search(
+            string
+        ):
+            return None
 
         for pattern in self.words_to_split:
             if not pattern.search(string):
@@ -174,14 +253,11 @@ class SymbolNameFormatter:
             ]
 
             if len(filtered) == 1 and filtered[0] == string:
-                break
-
-            for word in filtered:
-                self.split_component_inplace(word, output)
+                return None
 
-            return
+            return filtered
 
-        output.append(string)
+        return None
 
     def split_component_string(self, string: str) -> list[str]:
         for pattern in self.words_to_split:
@@ -198,7 +274,7 @@ class SymbolNameFormatter:
         result: list[Tuple[str, ComponentCase]] = []
         leftmost_interval: Tuple[str, int, int] | None = None
 
-        for capitalizer in self.capitalizers:
+        for capitalizer in self._merged_capitalizers:
             cap_result = capitalizer.suggest_capitalization(
                 string, has_leading_string=has_prev
             )
@@ -251,3 +327,28 @@ class SymbolNameFormatter:
             result.append(comp)
 
         return result
+
+
+# Matches backreferences, which refer to different groups once patterns are combined
+_backreference_regex = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _combined_pattern(patterns: list[re.Pattern]) -> re.Pattern | None:
+    """
+    Returns a pattern that matches wherever any of `patterns` matches, or `None`
+    if there are no patterns, or they cannot be combined into a single pattern.
+    """
+    if len(patterns) == 0:
+        return None
+    if any(pattern.flags != patterns[0].flags for pattern in patterns):
+        return None
+    if any(_backreference_regex.search(pattern.pattern) for pattern in patterns):
+        return None
+
+    try:
+        return re.compile(
+            "|".join(f"(?:{pattern.pattern})" for pattern in patterns),
+            patterns[0].flags,
+        )
+    except re.error:
+        return None
@@ -1,6 +1,7 @@
 import re
+import weakref
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError, dataclass, field
 from typing import Callable, Hashable, Iterable, Iterator, Optional, Tuple
 
 from enum import Enum
@@ -79,57 +80,113 @@ _mixed_case_matcher = re.compile(
 )
 
 
-@dataclass(repr=False, slots=True)
+@dataclass(repr=False, eq=False, frozen=True, slots=True)
 class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
     """
     A type that is used to describe a symbol name as a collection of words
     that are stitched together as a string to produce a final identifier name.
 
     Can be used for camelCase, PascalCase, and snake_case strings.
+
+    Symbol names are immutable: methods that change a name return a new name.
+    The string and hash of a name are computed once, when first requested.
     """
 
-    @dataclass(frozen=True, repr=False, slots=True)
     class Component(Hashable):
         """
         A component of a CompoundSymbolName.
-        """
+
+        Components are immutable and interned: creating a component that is
+        equal to one that is still alive returns that same instance, so equal
+        components can be compared by identity, and their hashes are computed
+        only once.
+        """
+
+        __slots__ = (
+            "string",
+            "prefix",
+            "suffix",
+            "joint_to_prev",
+            "string_case",
+            "_key",
+            "_hash",
+            "__weakref__",
+        )
 
         string: str
         "The string of this component"
 
-        prefix: Optional[str] = None
+        prefix: Optional[str]
         "An optional prefix that is prepended to this component when producing full strings."
 
-        suffix: Optional[str] = None
+        suffix: Optional[str]
         "An optional suffix that is appended to this component when producing full strings."
 
-        joint_to_prev: Optional[str] = None
+        joint_to_prev: Optional[str]
         "A string that is appended to this component if it follows another component in a symbol name."
 
-        string_case: ComponentCase = ComponentCase.ANY
+        string_case: ComponentCase
         "Specifies the suggested casing for this component."
 
+        _key: tuple[str, Optional[str], Optional[str], Optional[str], ComponentCase]
+        _hash: int
+
+        _interned: "weakref.WeakValueDictionary[tuple, CompoundSymbolName.Component]" = (
+            weakref.WeakValueDictionary()
+        )
+        "Components that are currently alive, keyed by `_key`."
+
+        def __new__(
+            cls,
+            string: str,
+            prefix: Optional[str] = None,
+            suffix: Optional[str] = None,
+            joint_to_prev: Optional[str] = None,
+            string_case: ComponentCase = ComponentCase.ANY,
+        ) -> "CompoundSymbolName.Component":
+            key = (string, prefix, suffix, joint_to_prev, string_case)
+
+            if (interned := cls._interned.get(key)) is not None:
+                return interned
+
+            self = object.__new__(cls)
+            object.__setattr__(self, "string", string)
+            object.__setattr__(self, "prefix", prefix)
+            object.__setattr__(self, "suffix", suffix)
+            object.__setattr__(self, "joint_to_prev", joint_to_prev)
+            object.__setattr__(self, "string_case", string_case)
+            object.__setattr__(self, "_key", key)
+            object.__setattr__(self, "_hash", hash(key))
+
+            cls._interned[key] = self
+
+            return self
+
+        def __setattr__(self, name: str, value) -> None:
+            raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+        def __delattr__(self, name: str) -> None:
+            raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+        def __reduce__(self):
+            # Unpickled components are interned as well
+            return (CompoundSymbolName.Component, self._key)
+
         def __repr__(self) -> str:
             return (
                 f"CompoundSymbolName.Component(string={self.string}, prefix={self.prefix}, suffix={self.suffix}, "
                 f"joint_to_prev={self.joint_to_prev}, string_case={self.string_case})"
             )
 
-        def __key(self):
-            return (
-                self.string,
-                self.prefix,
-                self.suffix,
-                self.joint_to_prev,
-                self.string_case,
-            )
-
         def __hash__(self) -> int:
-            return hash(self.__key())
+            return self._hash
 
         def __eq__(self, other: object) -> bool:
+            if self is other:
+                return True
+
             if isinstance(other, CompoundSymbolName.Component):
-                return self.__key() == other.__key()
+                return self._hash == other._hash and self._key == other._key
 
             return False
 
@@ -141,14 +198,10 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
             ...                              suffix="suffix", joint_to_prev="_",
             ...                              string_case=ComponentCase.LOWER).copy()
             CompoundSymbolName.Component(string=string, prefix=prefix, suffix=suffix, joint_to_prev=_, string_case=ComponentCase.LOWER)
+
+            Since components are immutable and interned, this is `self`.
             """
-            return CompoundSymbolName.Component(
-                self.string,
-                self.prefix,
-                self.suffix,
-                self.joint_to_prev,
-                self.string_case,
-            )
+            return self
 
         def with_string_only(
             self, string_case: ComponentCase | None = None
@@ -328,28 +381,45 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
 
     #
 
-    components: list[Component]
+    components: tuple[Component, ...]
+
+    _string: str | None = field(default=None, init=False)
+    "Cached result of `to_string()`."
+
+    _hash: int | None = field(default=None, init=False)
+    "Cached result of `__hash__()`."
 
-    def __init__(self, components: Iterable[Component] | list[Component] | None = None):
+    def __init__(self, components: Iterable[Component] | None = None):
         if components is None:
-            self.components = []
-            return
-        if isinstance(components, list):
-            self.components = components
-        else:
-            self.components = list(components)
+            components = ()
+        elif not isinstance(components, tuple):
+            components = tuple(components)
 
         assert all(
-            isinstance(comp, CompoundSymbolName.Component) for comp in self.components
+            isinstance(comp, CompoundSymbolName.Component) for comp in components
         )
 
+        object.__setattr__(self, "components", components)
+        object.__setattr__(self, "_string", None)
+        object.__setattr__(self, "_hash", None)
+
+    def __reduce__(self):
+        # Cached hashes depend on the hash seed of the process that computed
+        # them, so unpickled names compute their string and hash again
+        return (CompoundSymbolName, (self.components,))
+
     def __eq__(self, other) -> bool:
         if isinstance(other, CompoundSymbolName):
+            # Interned components are compared by identity first
             return self.components == other.components
         return False
 
     def __hash__(self) -> int:
-        return hash(frozenset(self.components))
+        if (result := self._hash) is None:
+            result = hash(self.components)
+            object.__setattr__(self, "_hash", result)
+
+        return result
 
     def __getitem__(self, index):
         return self.components[index]
@@ -483,9 +553,11 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
 
     def copy(self) -> "CompoundSymbolName":
         """
-        Performs a deep copy of this CompoundSymbolName and its components.
+        Returns an exact copy of this CompoundSymbolName.
+
+        Since symbol names and their components are immutable, this is `self`.
         """
-        return CompoundSymbolName(components=(c.copy() for c in self.components))
+        return self
 
     def startswith(self, string: str) -> bool:
         """
@@ -547,13 +619,14 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         joint_to_prev: str | None = None,
         string_case: ComponentCase = ComponentCase.ANY,
     ) -> "CompoundSymbolName":
-        copy = self.copy()
-        copy.components.append(
-            CompoundSymbolName.Component(
-                string, prefix, suffix, joint_to_prev, string_case
+        return CompoundSymbolName(
+            self.components
+            + (
+                CompoundSymbolName.Component(
+                    string, prefix, suffix, joint_to_prev, string_case
+                ),
             )
         )
-        return copy
 
     def prepending_component(
         self,
@@ -563,14 +636,14 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         joint_to_prev: str | None = None,
         string_case: ComponentCase = ComponentCase.ANY,
     ) -> "CompoundSymbolName":
-        copy = self.copy()
-        copy.components.insert(
-            0,
-            CompoundSymbolName.Component(
-                string, prefix, suffix, joint_to_prev, string_case
-            ),
+        return CompoundSymbolName(
+            (
+                CompoundSymbolName.Component(
+                    string, prefix, suffix, joint_to_prev, string_case
+                ),
+            )
+            + self.components
         )
-        return copy
 
     def mapping_components(
         self,
@@ -607,25 +680,25 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
             CompoundSymbolName.Component(string=name, prefix=None, suffix=None, joint_to_prev=_, string_case=ComponentCase.ANY)
         ])]
         """
-        current: CompoundSymbolName | None = None
+        current: list[CompoundSymbolName.Component] | None = None
         result = list()
 
         for i, comp in enumerate(self):
             if predicate(i, comp):
                 if current is not None:
-                    result.append(current)
+                    result.append(CompoundSymbolName(current))
                     current = None
 
                 if include_separator:
-                    result.append(CompoundSymbolName([comp.copy()]))
+                    result.append(CompoundSymbolName((comp,)))
             else:
                 if current is None:
-                    current = CompoundSymbolName([comp.copy()])
+                    current = [comp]
                 else:
-                    current.components.append(comp.copy())
+                    current.append(comp)
 
         if current is not None:
-            result.append(current)
+            result.append(CompoundSymbolName(current))
 
         return result
 
@@ -637,7 +710,7 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         ComponentCase.ANY, the casing of that element is manitained.
 
         >>> c = CompoundSymbolName.from_string_list('A', 'Symbol', 'NAME')
-        >>> c.components[2] = c.components[2].with_string_case(ComponentCase.UPPER)
+        >>> c = c.mapping_components(lambda i, comp: comp.with_string_case(ComponentCase.UPPER) if i == 2 else comp)
         >>> c.lower(force=False).to_string()
         'asymbolNAME'
 
@@ -646,7 +719,7 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         'asymbolname'
         """
 
-        return CompoundSymbolName(c.copy().lower(force=force) for c in self)
+        return CompoundSymbolName(c.lower(force=force) for c in self)
 
     def upper(self, force=False) -> "CompoundSymbolName":
         """
@@ -656,7 +729,7 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         ComponentCase.ANY, the casing of that element is manitained.
 
         >>> c = CompoundSymbolName.from_string_list('A', 'Symbol', 'name')
-        >>> c.components[2] = c.components[2].with_string_case(ComponentCase.LOWER)
+        >>> c = c.mapping_components(lambda i, comp: comp.with_string_case(ComponentCase.LOWER) if i == 2 else comp)
         >>> c.upper(force=False).to_string()
         'ASYMBOLname'
 
@@ -665,7 +738,7 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         'ASYMBOLNAME'
         """
 
-        return CompoundSymbolName(c.copy().upper(force=force) for c in self)
+        return CompoundSymbolName(c.upper(force=force) for c in self)
 
     def removing_prefixes(
         self, prefixes: list[str], case_sensitive=True
@@ -788,7 +861,7 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         ComponentCase.ANY, the casing of that element is maintained.
 
         >>> c = CompoundSymbolName.from_string_list('A', 'Symbol', 'NAME')
-        >>> c.components[2] = c.components[2].with_string_case(ComponentCase.UPPER)
+        >>> c = c.mapping_components(lambda i, comp: comp.with_string_case(ComponentCase.UPPER) if i == 2 else comp)
         >>> c.lower_snake_cased(force=False).to_string()
         'a_symbol_NAME'
 
@@ -814,7 +887,7 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         ComponentCase.ANY, the casing of that element is maintained.
 
         >>> c = CompoundSymbolName.from_string_list('A', 'Symbol', 'name')
-        >>> c.components[2] = c.components[2].with_string_case(ComponentCase.LOWER)
+        >>> c = c.mapping_components(lambda i, comp: comp.with_string_case(ComponentCase.LOWER) if i == 2 else comp)
         >>> c.upper_snake_cased(force=False).to_string()
         'A_SYMBOL_name'
 
@@ -889,7 +962,13 @@ class CompoundSymbolName(Sequence["CompoundSymbolName.Component"], Hashable):
         return self + other
 
     def to_string(self) -> str:
-        return "".join(c[1].to_string(c[0] > 0) for c in enumerate(self.components))
+        if (result := self._string) is None:
+            result = "".join(
+                c[1].to_string(c[0] > 0) for c in enumerate(self.components)
+            )
+            object.__setattr__(self, "_string", result)
+
+        return result
 
 
 if __name__ == "__main__":
@@ -81,6 +81,11 @@ class GeneratorConfig:
         conformances: list["ConformanceEntry"]
         formatter: "SwiftNameFormatting"
         filters: "Filters"
+        symbol_name_cache_size: int | None = 4096
+        """
+        Maximum number of generated Swift symbol names cached for each kind of C
+        declaration. `0` disables caching, and `None` removes the bound.
+        """
 
         @classmethod
         def from_json(cls, json: dict):
@@ -114,6 +119,7 @@ class GeneratorConfig:
                     json["swiftSymbolFormatting"]
                 ),
                 filters=cls.Filters.from_json(json["filters"]),
+                symbol_name_cache_size=json.get("symbolNameCacheSize", 4096),
             )
 
         @dataclass
@@ -161,10 +167,11 @@ class GeneratorConfig:
     class DocComments:
         collect: bool
         format: bool
+        lazy: bool = False
 
         @classmethod
         def from_json(cls, json: dict):
-            return cls(json["collect"], json["format"])
+            return cls(json["collect"], json["format"], json.get("lazy", False))
 
     @dataclass
     class FileGeneration:
@@ -1,54 +1,145 @@
-from typing import Iterable
+import bisect
+import itertools
+from typing import Iterable, Sequence
 from utils.data.swift_decl_visit_result import SwiftDeclVisitResult
 from utils.data.swift_decl_visitor import SwiftDeclVisitor
 from utils.data.swift_decls import SwiftDecl, SwiftDeclWalker
 
 
 class _PreCachingVisitor(SwiftDeclVisitor):
-    decl_stack: list[SwiftDecl]
-    _cached_results: dict[str, tuple[str, SwiftDecl]]
+    name_stack: list[str]
+    "Fully-qualified names of the declarations being visited."
+
+    _entries: dict[str, list[tuple[str, SwiftDecl]]]
 
-    def __init__(self):
-        self.decl_stack = list()
-        self._cached_results = dict()
+    def __init__(self, parent_name: str | None = None):
+        self.name_stack = [] if parent_name is None else [parent_name]
+        self._entries = dict()
 
     def generic_visit(self, decl: SwiftDecl) -> SwiftDeclVisitResult:
-        if decl.original_name is not None:
-            c_name = decl.original_name
+        # Create fully-qualified member name
+        name = decl.name.to_string()
+        if len(self.name_stack) > 0:
+            name = f"{self.name_stack[-1]}.{name}"
 
-            # Create fully-qualified member name
-            fully_qualified = ".".join(
-                map(lambda s: s.name.to_string(), self.decl_stack + [decl])
+        if decl.original_name is not None:
+            self._entries.setdefault(decl.original_name.lower(), []).append(
+                (name, decl)
             )
 
-            self._cached_results[c_name.lower()] = (fully_qualified, decl)
-
-        self.decl_stack.append(decl)
+        self.name_stack.append(name)
         return SwiftDeclVisitResult.VISIT_CHILDREN
 
     def generic_post_visit(self, decl: SwiftDecl):
-        self.decl_stack.pop()
+        self.name_stack.pop()
 
 
 class SwiftDeclLookup:
     """
     Supports looking up Swift symbol names based on original C symbols.
+
+    Lookups can be kept up to date as declarations are added or removed with
+    `add_decl()` and `remove_decl()`, instead of being recreated with
+    `from_decls()`.
+    """
+
+    _versions = itertools.count()
+
+    version: int
+    """
+    Identifies the contents of this lookup. Unique across every lookup created
+    by this process, and changed whenever declarations are added or removed, so
+    results derived from a lookup can be cached by version.
     """
 
     _cached_results: dict[str, tuple[str, SwiftDecl]]
 
-    def __init__(self, cache: dict[str, tuple[str, SwiftDecl]]):
+    _entries: dict[str, list[tuple[str, SwiftDecl]]]
+    """
+    Every declaration found for each C symbol, in walk order. The last entry is
+    the one in `_cached_results`.
+    """
+
+    _sorted_keys: list[str] | None
+    "Sorted keys of `_cached_results`, created on demand by nearest-match queries."
+
+    def __init__(
+        self,
+        cache: dict[str, tuple[str, SwiftDecl]],
+        entries: dict[str, list[tuple[str, SwiftDecl]]] | None = None,
+    ):
         self._cached_results = cache
+        if entries is None:
+            entries = {key: [value] for key, value in cache.items()}
+        self._entries = entries
+        self._sorted_keys = None
+        self.version = next(SwiftDeclLookup._versions)
 
     @classmethod
     def from_decls(cls, decls: Iterable[SwiftDecl]):
-        visitor = _PreCachingVisitor()
-        walker = SwiftDeclWalker(visitor)
+        entries = cls._collect_entries(decls)
+
+        return cls(
+            {key: values[-1] for key, values in entries.items()},
+            entries,
+        )
+
+    def add_decl(
+        self,
+        decl: SwiftDecl,
+        parents: Sequence[SwiftDecl] = (),
+        first: bool = False,
+    ):
+        """
+        Adds a declaration and its nested declarations to this lookup.
 
-        for decl in decls:
-            walker.walk_decl(decl)
+        `parents` are the declarations `decl` is nested in, outermost first. If
+        `first` is `True`, the declaration only takes precedence over other
+        declarations for the same C symbol that are removed later, as if it was
+        visited before any of them.
+        """
+        entries = self._collect_entries([decl], self._qualified_name(parents))
+
+        for key, values in entries.items():
+            existing = self._entries.setdefault(key, [])
+
+            if first:
+                existing[0:0] = values
+            else:
+                existing.extend(values)
+
+            self._cached_results[key] = existing[-1]
+
+        self._sorted_keys = None
+        self.version = next(SwiftDeclLookup._versions)
+
+    def remove_decl(self, decl: SwiftDecl, parents: Sequence[SwiftDecl] = ()):
+        """
+        Removes a declaration and its nested declarations from this lookup.
+
+        Declarations are matched by C symbol and fully-qualified Swift name, so
+        copies of a declaration that was added can also be removed.
+        """
+        entries = self._collect_entries([decl], self._qualified_name(parents))
+
+        for key, values in entries.items():
+            if (existing := self._entries.get(key)) is None:
+                continue
 
-        return cls(visitor._cached_results)
+            for name, _ in values:
+                for index in reversed(range(len(existing))):
+                    if existing[index][0] == name:
+                        del existing[index]
+                        break
+
+            if len(existing) > 0:
+                self._cached_results[key] = existing[-1]
+            else:
+                del self._entries[key]
+                del self._cached_results[key]
+
+        self._sorted_keys = None
+        self.version = next(SwiftDeclLookup._versions)
 
     def lookup_c_symbol(self, c_symbol: str) -> str | None:
         """
@@ -57,7 +148,7 @@ class SwiftDeclLookup:
 
         Lookups return a string that represents the module-level qualified accessor \
         for the symbol, e.g.:
-        
+
         ```
         'A_C_ENUM' -> 'ACEnum'
         'A_C_ENUM_CASE' -> 'ACEnum.aCEnumCase'
@@ -69,6 +160,54 @@ class SwiftDeclLookup:
 
         return None
 
+    def lookup_nearest_c_symbol(self, c_symbol: str) -> tuple[str, str] | None:
+        """
+        Looks up the longest C symbol that matches the start of `c_symbol` up to
+        the end of an identifier, returning the portion of `c_symbol` that was
+        matched and the partially-qualified Swift name of the symbol, e.g.:
+
+        ```
+        'A_C_FUNCTION()' -> ('A_C_FUNCTION', 'ACType.aCFunction')
+        'A_C_ENUM::member' -> ('A_C_ENUM', 'ACEnum')
+        ```
+
+        Returns `None` if no C symbol matches.
+        """
+        query = c_symbol.lower()
+
+        if result := self._cached_results.get(query):
+            return (c_symbol, result[0])
+
+        keys = self._get_sorted_keys()
+        end = len(query)
+
+        # Each step either finds a match or shortens the candidate prefix
+        while end > 0:
+            index = bisect.bisect_right(keys, query[:end])
+            if index == 0:
+                return None
+
+            key = keys[index - 1]
+            common = _common_prefix_length(key, query, end)
+
+            if common < len(key):
+                end = common
+                continue
+
+            # Only match whole identifiers
+            if not _is_identifier_char(query[len(key)]):
+                return (c_symbol[: len(key)], self._cached_results[key][0])
+
+            end = len(key) - 1
+
+        return None
+
+    def _get_sorted_keys(self) -> list[str]:
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._cached_results)
+
+        return self._sorted_keys
+
     def _lookup_c_symbol_decl(self, c_symbol: str) -> tuple[str, SwiftDecl] | None:
         """
         Looks up C symbol names, returning the partially-qualified Swift declaration
@@ -76,3 +215,35 @@ class SwiftDeclLookup:
         """
 
         return self._cached_results.get(c_symbol.lower())
+
+    @classmethod
+    def _collect_entries(
+        cls, decls: Iterable[SwiftDecl], parent_name: str | None = None
+    ) -> dict[str, list[tuple[str, SwiftDecl]]]:
+        visitor = _PreCachingVisitor(parent_name)
+        walker = SwiftDeclWalker(visitor)
+
+        for decl in decls:
+            walker.walk_decl(decl)
+
+        return visitor._entries
+
+    def _qualified_name(self, decls: Sequence[SwiftDecl]) -> str | None:
+        if len(decls) == 0:
+            return None
+
+        return ".".join(decl.name.to_string() for decl in decls)
+
+
+def _common_prefix_length(a: str, b: str, limit: int) -> int:
+    limit = min(limit, len(a), len(b))
+
+    for index in range(limit):
+        if a[index] != b[index]:
+            return index
+
+    return limit
+
+
+def _is_identifier_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
@@ -11,7 +11,11 @@ from utils.data.compound_symbol_name import CompoundSymbolName
 from utils.data.swift_decl_visit_result import SwiftDeclVisitResult
 from utils.data.swift_decl_visitor import SwiftDeclVisitor
 from utils.data.swift_type import SwiftType
-from utils.doccomment.doccomment_block import DoccommentBlock
+from utils.doccomment.doccomment_block import (
+    DeferredDoccommentBlock,
+    DoccommentBlock,
+    resolve_doccomment,
+)
 
 
 class SwiftAccessLevel(Enum):
@@ -136,14 +140,17 @@ class SwiftDecl(object):
 
     c_kind: CDeclKind
 
-    doccomment: DoccommentBlock | None
-    "A block of doc comments associated with this element."
+    doccomment: DoccommentBlock | DeferredDoccommentBlock | None
+    """
+    A block of doc comments associated with this element. May be deferred, in
+    which case it is only resolved once this declaration is written.
+    """
 
     def write(self, stream: SyntaxStream):
-        if self.doccomment is None:
+        if (doccomment := resolve_doccomment(self.doccomment)) is None:
             return
 
-        comment_str = self.doccomment.comment_contents
+        comment_str = doccomment.comment_contents
 
         for line in comment_str.splitlines():
             stream.line(f"/// {line}")
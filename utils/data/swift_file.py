@@ -1,3 +1,4 @@
+import io
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -35,3 +36,9 @@ class SwiftFile:
         for decl in self.decls:
             stream.line()
             decl.write(stream)
+
+    def render(self) -> str:
+        """Returns the full contents of this file as a string."""
+        buffer = io.StringIO()
+        self.write(SyntaxStream(buffer))
+        return buffer.getvalue()
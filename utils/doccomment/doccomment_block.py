@@ -159,6 +159,18 @@ class DoccommentBlock:
 
         return first.merging(second)
 
+    @classmethod
+    def merge_deferrable(
+        cls,
+        first: "DoccommentBlock | DeferredDoccommentBlock | None",
+        second: "DoccommentBlock | DeferredDoccommentBlock | None",
+    ) -> "DoccommentBlock | DeferredDoccommentBlock | None":
+        """
+        Merges two doc comments like `merge()`, deferring the merge until the
+        result is resolved if either comment is deferred.
+        """
+        return DeferredDoccommentBlock.combine(first, second, cls.merge)
+
     @classmethod
     def merge_list(cls, docs: "Iterable[DoccommentBlock]") -> "DoccommentBlock | None":
         docs_list = list(docs)
@@ -183,3 +195,83 @@ class DoccommentBlock:
             comment_contents=string,
             line_count=string.count("\n") + 1,
         )
+
+
+class DeferredDoccommentBlock:
+    """
+    A doc comment that is only looked up, or transformed, once its contents are
+    needed, via `resolve()`.
+
+    Deferred doc comments are resolved before being pickled.
+    """
+
+    _resolver: Callable[[], DoccommentBlock | None] | None
+    _resolved: DoccommentBlock | None
+
+    def __init__(self, resolver: Callable[[], DoccommentBlock | None]):
+        self._resolver = resolver
+        self._resolved = None
+
+    def __reduce__(self):
+        return (DeferredDoccommentBlock.resolved, (self.resolve(),))
+
+    @classmethod
+    def resolved(cls, comment: DoccommentBlock | None) -> "DeferredDoccommentBlock":
+        """Returns a deferred doc comment that resolves to `comment`."""
+        result = cls(lambda: comment)
+        result.resolve()
+        return result
+
+    def resolve(self) -> DoccommentBlock | None:
+        """Returns the doc comment, looking it up the first time this method is called."""
+        if self._resolver is not None:
+            self._resolved = self._resolver()
+            self._resolver = None
+
+        return self._resolved
+
+    def map(
+        self, transform: Callable[[DoccommentBlock], DoccommentBlock | None]
+    ) -> "DeferredDoccommentBlock":
+        """Returns a deferred doc comment that applies `transform` to this doc comment, if it resolves to one."""
+
+        def resolver() -> DoccommentBlock | None:
+            if (comment := self.resolve()) is None:
+                return None
+
+            return transform(comment)
+
+        return DeferredDoccommentBlock(resolver)
+
+    @classmethod
+    def combine(
+        cls,
+        first: "DoccommentBlock | DeferredDoccommentBlock | None",
+        second: "DoccommentBlock | DeferredDoccommentBlock | None",
+        combiner: Callable[
+            [DoccommentBlock | None, DoccommentBlock | None], DoccommentBlock | None
+        ],
+    ) -> "DoccommentBlock | DeferredDoccommentBlock | None":
+        """
+        Combines two doc comments with `combiner`, deferring the call until the
+        result is resolved if either comment is deferred.
+        """
+        if not (
+            isinstance(first, DeferredDoccommentBlock)
+            or isinstance(second, DeferredDoccommentBlock)
+        ):
+            return combiner(first, second)
+
+        return DeferredDoccommentBlock(
+            lambda: combiner(resolve_doccomment(first), resolve_doccomment(second))
+        )
+
+
+def resolve_doccomment(
+    comment: DoccommentBlock | DeferredDoccommentBlock | None,
+) -> DoccommentBlock | None:
+    """Returns `comment`, resolving it first if it is deferred."""
+    if isinstance(comment, DeferredDoccommentBlock):
+        return comment.resolve()
+
+    return comment
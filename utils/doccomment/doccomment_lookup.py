@@ -1,11 +1,16 @@
 import io
+import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
-from typing import Sequence
+from typing import Iterable, Sequence
 
+from utils.cache.doccomment_index_cache import DoccommentIndexCache
+from utils.cache.file_fingerprint import FileFingerprint
 from utils.data.swift_decl_visitor import SwiftDeclCallableVisitor
 from utils.data.swift_decls import SwiftDecl, SwiftDeclWalker
-from utils.doccomment.doccomment_block import DoccommentBlock
+from utils.doccomment.doccomment_block import DeferredDoccommentBlock, DoccommentBlock
 
 
 @dataclass(init=False)
@@ -15,6 +20,12 @@ class _CachedFile:
     path: Path
     doccomments: list[DoccommentBlock]
     doccomment_line_map: dict[int, DoccommentBlock]
+    leading_doccomment_map: dict[int, DoccommentBlock]
+    """
+    Maps lines to the normalized doc comment that documents a declaration on
+    that line, either inline with it, or merged from the doc comments that
+    directly precede it. Lines with no such doc comment are not present.
+    """
 
     def __init__(self, path, doccomments: Sequence[DoccommentBlock]):
         self.path = path
@@ -26,12 +37,53 @@ class _CachedFile:
             for line in range(comment.line, comment.end_line()):
                 self.doccomment_line_map[line] = comment
 
+        # Only lines with, or directly after, a doc comment can have a leading
+        # doc comment
+        self.leading_doccomment_map = dict()
+        for line in self.doccomment_line_map.keys() | {
+            line + 1 for line in self.doccomment_line_map
+        }:
+            if (leading := self._compute_leading_doccomment(line)) is not None:
+                self.leading_doccomment_map[line] = leading
+
     def has_comment_on_line(self, line: int):
         return line in self.doccomment_line_map
 
     def comment_on_line(self, line: int):
         return self.doccomment_line_map.get(line)
 
+    def leading_doccomment(self, line: int) -> DoccommentBlock | None:
+        """Returns the doc comment for a declaration on a given line, if any."""
+        return self.leading_doccomment_map.get(line)
+
+    def _compute_leading_doccomment(self, line: int) -> DoccommentBlock | None:
+        # Attempt to intercept comments that are inline with the declaration
+        inline = self.comment_on_line(line)
+        if inline is not None:
+            return inline.normalize_indentation()
+
+        # Collect all single-line doc comment lines that precede the definition
+        # line until we reach a line that is not a doc comment, at which case
+        # return the collected doc comment lines.
+        collected = []
+        for i in reversed(range(line)):
+            doc = self.comment_on_line(i)
+
+            if doc is None:
+                break
+
+            collected.append(doc)
+
+            # Quit after multi-line doc comments
+            if doc.is_multi_lined():
+                break
+
+        merged = DoccommentBlock.merge_list(reversed(collected))
+        if merged is None:
+            return None
+
+        return merged.normalize_indentation()
+
 
 class DoccommentLookup:
     """
@@ -43,9 +95,17 @@ class DoccommentLookup:
     doccomment_patterns: list[str]
     "Note: should be sorted by length in descending order"
 
-    def __init__(self, doccomment_patterns: list[str]) -> None:
+    index_cache: DoccommentIndexCache | None
+    "Persistent cache of the doc comments found in each file, if any."
+
+    def __init__(
+        self,
+        doccomment_patterns: list[str],
+        index_cache: DoccommentIndexCache | None = None,
+    ) -> None:
         self._cached_files = dict()
         self.doccomment_patterns = sorted(doccomment_patterns, key=len, reverse=True)
+        self.index_cache = index_cache
 
     def populate_doc_comments(self, decls: Sequence[SwiftDecl]) -> list[SwiftDecl]:
         """Populates doc comments for a provided sequence of Swift declarations, returning a list of copies of the declarations with doccomments populated."""
@@ -54,9 +114,14 @@ class DoccommentLookup:
         self.populate_doc_comments_inplace(results)
         return results
 
-    def populate_doc_comments_inplace(self, decls: Sequence[SwiftDecl]):
-        """Populates doc comments for a provided sequence of Swift declarations, modifying each declaration in-place."""
-        self._pre_fetch_files(decls)
+    def populate_doc_comments_inplace(self, decls: Sequence[SwiftDecl], jobs: int = 1):
+        """
+        Populates doc comments for a provided sequence of Swift declarations, modifying each declaration in-place.
+
+        If `jobs > 1`, files that are not cached yet are read and indexed in
+        parallel across a pool of worker processes, one file per task.
+        """
+        self._pre_fetch_files(decls, jobs)
 
         visitor = SwiftDeclCallableVisitor(self._populate)
         walker = SwiftDeclWalker(visitor)
@@ -64,81 +129,124 @@ class DoccommentLookup:
         for decl in decls:
             walker.walk_decl(decl)
 
+    def populate_deferred_doc_comments_inplace(self, decls: Sequence[SwiftDecl]):
+        """
+        Populates deferred doc comments for a provided sequence of Swift
+        declarations, modifying each declaration in-place. Files are only read
+        once a doc comment within them is resolved.
+        """
+        visitor = SwiftDeclCallableVisitor(self._populate_deferred)
+        walker = SwiftDeclWalker(visitor)
+
+        for decl in decls:
+            walker.walk_decl(decl)
+
+    def invalidate(self, paths: Iterable[Path]):
+        """
+        Removes cached doc comments of the given files, causing them to be read
+        again from disk on the next lookup.
+        """
+        resolved = {path.resolve() for path in paths}
+
+        for cached_path in list(self._cached_files):
+            if cached_path.resolve() in resolved:
+                del self._cached_files[cached_path]
+
     def _populate(self, decl: SwiftDecl):
         decl.doccomment = self._find_doccomment(decl)
 
-    def _pre_fetch_files(self, decls: Sequence[SwiftDecl]):
+    def _populate_deferred(self, decl: SwiftDecl):
+        # The original node is required for this lookup.
+        if decl.original_node is None or (origin := decl.origin) is None:
+            decl.doccomment = None
+            return
+
+        decl.doccomment = DeferredDoccommentBlock(
+            lambda: self._find_doccomment_at(origin.file, origin.line)
+        )
+
+    def _pre_fetch_files(self, decls: Sequence[SwiftDecl], jobs: int = 1):
         """
         Pre-populates the doc comments cache based on the paths referenced by each
         declaration in `decls`.
         """
-        paths: set[Path] = set()
+        paths: dict[Path, None] = dict()
         for decl in decls:
-            if origin := decl.origin:
-                paths.add(origin.file)
+            if (origin := decl.origin) and origin.file not in self._cached_files:
+                paths[origin.file] = None
 
-        for path in paths:
-            result = _fetch_as_cached_file(path, self.doccomment_patterns)
+        for result in self._load_files(list(paths), jobs):
             if result is None:
                 continue
 
             self._cached_files[result.path] = result
 
+    def _load_files(
+        self, paths: Sequence[Path], jobs: int
+    ) -> Iterable[_CachedFile | None]:
+        if jobs <= 1 or len(paths) <= 1:
+            return [self._load_file(path) for path in paths]
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            return list(
+                executor.map(
+                    _load_cached_file,
+                    paths,
+                    repeat(self.doccomment_patterns),
+                    repeat(self.index_cache),
+                )
+            )
+
     def _find_doccomment(self, decl: SwiftDecl) -> DoccommentBlock | None:
         # The original node is required for this lookup.
         if decl.original_node is None or decl.origin is None:
             return None
 
-        decl_file_path = decl.origin.file
-        decl_line_num = decl.origin.line
+        return self._find_doccomment_at(decl.origin.file, decl.origin.line)
 
-        if (cached_file := self._fetch_file_cached(decl_file_path)) is None:
+    def _find_doccomment_at(self, file_path: Path, line: int) -> DoccommentBlock | None:
+        if (cached_file := self._fetch_file_cached(file_path)) is None:
             return None
 
-        # Attempt to intercept comments that are inline with the declaration
-        inline = self._doccomment_for_line(cached_file, decl_line_num)
-        if inline is not None:
-            return inline.normalize_indentation()
+        return cached_file.leading_doccomment(line)
 
-        # Collect all single-line doc comment lines that precede the definition
-        # line until we reach a line that is not a doc comment, at which case
-        # return the collected doc comment lines.
-        collected = []
-        for i in reversed(range(decl_line_num)):
-            doc = self._doccomment_for_line(cached_file, i)
+    def _fetch_file_cached(self, file_path: Path) -> _CachedFile | None:
+        if cached_file := self._cached_files.get(file_path):
+            return cached_file
 
-            if doc is None:
-                break
+        if (cache_file := self._load_file(file_path)) is None:
+            return None
 
-            collected.append(doc)
+        self._cached_files[file_path] = cache_file
 
-            # Quit after multi-line doc comments
-            if doc.is_multi_lined():
-                break
+        return cache_file
 
-        merged = DoccommentBlock.merge_list(reversed(collected))
-        if merged is None:
-            return None
+    def _load_file(self, file_path: Path) -> _CachedFile | None:
+        return _load_cached_file(file_path, self.doccomment_patterns, self.index_cache)
 
-        return merged.normalize_indentation()
 
-    def _doccomment_for_line(
-        self, cached_file: _CachedFile, line: int
-    ) -> DoccommentBlock | None:
-        return cached_file.comment_on_line(line)
+def _load_cached_file(
+    file_path: Path,
+    doccomment_patterns: list[str],
+    index_cache: DoccommentIndexCache | None,
+) -> _CachedFile | None:
+    if index_cache is None:
+        return _fetch_as_cached_file(file_path, doccomment_patterns)
+
+    if (comments := index_cache.fetch(file_path, doccomment_patterns)) is not None:
+        return _CachedFile(file_path, comments)
 
-    def _fetch_file_cached(self, file_path: Path) -> _CachedFile | None:
-        if cached_file := self._cached_files.get(file_path):
-            return cached_file
+    try:
+        fingerprint = FileFingerprint.from_path(file_path)
+    except OSError:
+        return None
 
-        if (
-            cache_file := _fetch_as_cached_file(file_path, self.doccomment_patterns)
-        ) is None:
-            return None
+    if (comments := _fetch_file(file_path, doccomment_patterns)) is None:
+        return None
 
-        self._cached_files[file_path] = cache_file
+    index_cache.store(file_path, doccomment_patterns, fingerprint, comments)
 
-        return cache_file
+    return _CachedFile(file_path, comments)
 
 
 def _fetch_as_cached_file(
@@ -160,6 +268,12 @@ def _fetch_file(
         return _split_doccomment_lines(file_path, file, doccomment_patterns)
 
 
+# Matches the start of string literals and of line/multi-line comments.
+_token_regex = re.compile(r'"|/[/*]')
+# Matches the end of a string literal.
+_string_end_regex = re.compile(r'(?<!\\)"')
+
+
 def _split_doccomment_lines(
     path: Path, text_stream: io.TextIOBase, doccomment_patterns: list[str]
 ) -> list[DoccommentBlock]:
@@ -187,86 +301,52 @@ def _split_doccomment_lines(
 
         return None
 
+    text = text_stream.read()
     result: list[DoccommentBlock] = []
 
+    # Line numbers are computed incrementally, by counting line breaks between
+    # consecutive comments.
     line = 1
-    column = 0
+    line_scan_index = 0
+
+    index = 0
+    while (match := _token_regex.search(text, index)) is not None:
+        start = match.start()
 
-    current_line = 0
-    current_column = 0
-    current_contents = ""
+        if match.group() == '"':
+            # Skip string literal; unterminated strings run until the end of the file
+            if (end := _string_end_regex.search(text, start + 1)) is None:
+                break
 
-    state_default = 0
-    state_line_comment = 1
-    state_multi_line_comment = 2
-    state_string = 3
+            index = end.end()
+            continue
 
-    state = state_default
+        # Comments are reported at the position of their second character, with
+        # columns starting at 1.
+        line += text.count("\n", line_scan_index, start + 1)
+        line_scan_index = start + 1
+        column = start + 1 - text.rfind("\n", 0, start + 1)
 
-    last_char = ""
-    index = 0
-    while (next := text_stream.read(1)) != "":
-        index += 1
-        if next == "\n":
-            column = 0
-            line += 1
+        if match.group() == "//":
+            # Line comment; comments that are not terminated by a line break are
+            # not reported.
+            if (end_index := text.find("\n", start + 2)) == -1:
+                break
+
+            contents = text[start:end_index]
+            index = end_index + 1
         else:
-            column += 1
-
-        if state == state_default:  # Regular JSON structure stream
-            if next == '"':
-                # Start of string literal
-                state = state_string
-            elif last_char == "/":
-                # Keep recording the indices regardless of whether this is a
-                # comment or not to reduce duplication
-                current_line = line
-                current_column = column
-
-                if next == "/":
-                    # Line comment
-                    state = state_line_comment
-                    current_contents = "//"
-                elif next == "*":
-                    # Multi-line comment
-                    state = state_multi_line_comment
-                    current_contents = "/*"
-        elif state == state_line_comment:  # Inside line comment
-            if next == "\n":
-                # End of comment; back to regular JSON stream
-                state = state_default
-
-                if new_comment := close_current(
-                    current_line, current_column, current_contents
-                ):
-                    result.append(new_comment)
-            else:
-                current_contents += next
-        elif state == state_multi_line_comment:  # Inside multi-line comment
-            if next == "/" and last_char == "*":
-                # Explicit end of comment block; back to regular JSON stream
-                state = state_default
-                current_contents += "*/"
-
-                if new_comment := close_current(
-                    current_line, current_column, current_contents
-                ):
-                    result.append(new_comment)
-            else:
-                current_contents += next
-        elif state == state_string:  # Inside string literal
-            if next == '"' and last_char != "\\":  # Escaped string terminator check
-                # End of string; back to regular JSON stream
-                state = state_default
-
-        last_char = next
-
-    # Finish any existing comment
-    if state == state_line_comment or state == state_multi_line_comment:
-        close_current(
-            current_line,
-            current_column,
-            current_contents,
-        )
+            # Multi-line comment; the terminator may share the '*' of the opener.
+            # Unterminated comments are not reported.
+            if (end_index := text.find("*/", start + 1)) == -1:
+                break
+
+            contents = "/*" + text[start + 2 : end_index + 1] + "*/"
+
+            # The closing '/' may also open a new comment right after this one.
+            index = end_index + 1
+
+        if new_comment := close_current(line, column, contents):
+            result.append(new_comment)
 
     return result
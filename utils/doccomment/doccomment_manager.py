@@ -1,16 +1,42 @@
+from concurrent.futures import ProcessPoolExecutor
 from typing import Sequence
 from utils.collection.collection_utils import flatten
+from utils.collection.lru_cache import LRUCache
 from utils.data.generator_config import GeneratorConfig
 from utils.data.swift_decl_lookup import SwiftDeclLookup
 from utils.data.swift_decl_visitor import SwiftDeclCallableVisitor
 from utils.data.swift_decls import SwiftDecl, SwiftDeclWalker
+from utils.doccomment.doccomment_block import (
+    DeferredDoccommentBlock,
+    DoccommentBlock,
+    resolve_doccomment,
+)
 from utils.doccomment.doccomment_formatter import DoccommentFormatter
 from utils.doccomment.doccomment_lookup import DoccommentLookup
 from utils.doccomment.flavors.doccomment_doxygen import DoccommentFlavorDoxygen
 from utils.doccomment.flavors.doccomment_flavor import DoccommentFlavor
 
 
+_MIN_DECLS_PER_FORMAT_JOB = 4096
+"""
+Minimum number of declarations, including nested declarations, per job to
+format doc comments in parallel; below this, starting worker processes costs
+more than formatting serially.
+"""
+
+
 class DoccommentManager:
+    format_cache: LRUCache[tuple[str, int, int], DoccommentBlock]
+    """
+    Formatted doc comments, keyed by the contents and line count of the comment
+    before formatting, and by the version of the `SwiftDeclLookup` used to
+    format it.
+
+    Formatting is assumed to depend only on those, and not on the declaration
+    a comment belongs to; cached results have their file, line and column
+    replaced with the ones from each comment that is formatted.
+    """
+
     def __init__(
         self,
         lookup: DoccommentLookup,
@@ -18,12 +44,16 @@ class DoccommentManager:
         formatter: DoccommentFormatter,
         should_collect: bool,
         should_format: bool,
+        should_defer: bool = False,
+        format_cache_size: int | None = 4096,
     ):
         self.lookup = lookup
         self.flavors = flavors
         self.formatter = formatter
         self.should_collect = should_collect
         self.should_format = should_format
+        self.should_defer = should_defer
+        self.format_cache = LRUCache(format_cache_size)
 
     @classmethod
     def from_config(cls, config: GeneratorConfig.DocComments):
@@ -39,23 +69,60 @@ class DoccommentManager:
             formatter=DoccommentFormatter(),
             should_collect=config.collect,
             should_format=config.format,
+            should_defer=config.lazy,
         )
 
-    def populate(self, decls: Sequence[SwiftDecl]):
-        """Populates doc comments for provided declarations. Comments are sourced from each declaration's `origin`."""
+    def populate(self, decls: Sequence[SwiftDecl], jobs: int = 1):
+        """
+        Populates doc comments for provided declarations. Comments are sourced from each declaration's `origin`.
+
+        If `self.should_defer` is `True`, comments are deferred, and files are
+        only read once a declaration's doc comment is resolved. Otherwise, if
+        `jobs > 1`, files are read in parallel across a pool of worker processes.
+        """
 
         if not self.should_collect:
             return
 
-        self.lookup.populate_doc_comments_inplace(decls)
+        if self.should_defer:
+            self.lookup.populate_deferred_doc_comments_inplace(decls)
+        else:
+            self.lookup.populate_doc_comments_inplace(decls, jobs)
+
+    def format(
+        self,
+        decls: Sequence[SwiftDecl],
+        jobs: int = 1,
+        swift_lookup: SwiftDeclLookup | None = None,
+    ):
+        """
+        Formats doc comments from provided declarations inplace. Deferred doc comments are formatted once they are resolved.
+        References to C symbols are resolved with `swift_lookup`, which is
+        created from `decls` if not provided.
 
-    def format(self, decls: Sequence[SwiftDecl]):
-        """Formats doc comments from provided declarations inplace."""
+        If `jobs > 1`, top-level declarations are split into contiguous shards
+        that are formatted in parallel across a pool of worker processes; the
+        formatted doc comments are then assigned back in declaration order.
+        """
 
         if not self.should_format:
             return
 
-        swift_lookup = SwiftDeclLookup.from_decls(decls)
+        if swift_lookup is None:
+            swift_lookup = SwiftDeclLookup.from_decls(decls)
+
+        # Deferred doc comments would be resolved when sent to a worker process
+        if (
+            jobs <= 1
+            or self.should_defer
+            or len(_flatten_decls(decls)) < jobs * _MIN_DECLS_PER_FORMAT_JOB
+        ):
+            self.__format_decls(decls, swift_lookup)
+            return
+
+        self.__format_parallel(decls, swift_lookup, jobs)
+
+    def __format_decls(self, decls: Sequence[SwiftDecl], swift_lookup: SwiftDeclLookup):
         visitor = SwiftDeclCallableVisitor(
             lambda decl: self.__format(decl, swift_lookup)
         )
@@ -64,12 +131,174 @@ class DoccommentManager:
         for decl in decls:
             walker.walk_decl(decl)
 
+    def __format_parallel(
+        self, decls: Sequence[SwiftDecl], swift_lookup: SwiftDeclLookup, jobs: int
+    ):
+        shards = _split_shards(decls, jobs * 4)
+
+        # Workers get a copy of this manager without any cached doc comment files
+        worker = DoccommentManager(
+            lookup=DoccommentLookup(self.lookup.doccomment_patterns),
+            flavors=self.flavors,
+            formatter=self.formatter,
+            should_collect=False,
+            should_format=True,
+            format_cache_size=self.format_cache.max_size,
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_format_worker,
+            initargs=(worker, swift_lookup, decls),
+        ) as executor:
+            for (start, stop), results in zip(
+                shards, executor.map(_format_shard, shards)
+            ):
+                for decl, result in zip(_flatten_decls(decls[start:stop]), results):
+                    decl.doccomment = self.__formatted_result(decl.doccomment, result)
+
+    def __formatted_result(
+        self,
+        original: DoccommentBlock | DeferredDoccommentBlock | None,
+        result: tuple[str, int] | None,
+    ) -> DoccommentBlock | None:
+        """Returns the doc comment formatted by a worker process at the file, line and column of `original`."""
+        if result is None or not isinstance(original, DoccommentBlock):
+            return None
+
+        contents, line_count = result
+
+        return DoccommentBlock(
+            file=original.file,
+            line=original.line,
+            column=original.column,
+            comment_contents=contents,
+            line_count=line_count,
+        )
+
+    def _format_shard(
+        self,
+        decls: Sequence[SwiftDecl],
+        swift_lookup: SwiftDeclLookup,
+        shard: tuple[int, int],
+    ) -> list[tuple[str, int] | None]:
+        """
+        Formats the doc comments of the top-level declarations within
+        `decls[start:stop]`, returning the contents and line count of each
+        formatted doc comment in walk order.
+        """
+        start, stop = shard
+        self.__format_decls(decls[start:stop], swift_lookup)
+
+        result: list[tuple[str, int] | None] = []
+
+        for decl in _flatten_decls(decls[start:stop]):
+            if (comment := resolve_doccomment(decl.doccomment)) is None:
+                result.append(None)
+            else:
+                result.append((comment.comment_contents, comment.line_count))
+
+        return result
+
     def __format(self, decl: SwiftDecl, swift_lookup: SwiftDeclLookup):
-        for flavor in self.flavors:
-            decl.doccomment = flavor.transform_doccomment(
-                decl.doccomment, decl, swift_lookup
+        comment = decl.doccomment
+        if comment is None:
+            return
+
+        if isinstance(comment, DeferredDoccommentBlock):
+            decl.doccomment = comment.map(
+                lambda comment: self.__format_comment(comment, decl, swift_lookup)
             )
+        else:
+            decl.doccomment = self.__format_comment(comment, decl, swift_lookup)
+
+    def __format_comment(
+        self, comment: DoccommentBlock, decl: SwiftDecl, swift_lookup: SwiftDeclLookup
+    ) -> DoccommentBlock | None:
+        key = (comment.comment_contents, comment.line_count, swift_lookup.version)
+
+        if (formatted := self.format_cache.get(key)) is not None:
+            return self.__relocated(formatted, comment)
+
+        result = self.__format_uncached(comment, decl, swift_lookup)
+
+        if result is not None:
+            self.format_cache.put(key, result)
+
+        return result
 
-        decl.doccomment = self.formatter.format_doccomment(
-            decl.doccomment, decl, swift_lookup
+    def __format_uncached(
+        self, comment: DoccommentBlock, decl: SwiftDecl, swift_lookup: SwiftDeclLookup
+    ) -> DoccommentBlock | None:
+        result: DoccommentBlock | None = comment
+
+        for flavor in self.flavors:
+            result = flavor.transform_doccomment(result, decl, swift_lookup)
+
+        return self.formatter.format_doccomment(result, decl, swift_lookup)
+
+    def __relocated(
+        self, formatted: DoccommentBlock, original: DoccommentBlock
+    ) -> DoccommentBlock:
+        """Returns `formatted` placed at the file, line and column of `original`."""
+        return DoccommentBlock(
+            file=original.file,
+            line=original.line,
+            column=original.column,
+            comment_contents=formatted.comment_contents,
+            line_count=formatted.line_count,
         )
+
+
+_format_worker_state: (
+    tuple[DoccommentManager, SwiftDeclLookup, Sequence[SwiftDecl]] | None
+) = None
+
+
+def _init_format_worker(
+    manager: DoccommentManager,
+    swift_lookup: SwiftDeclLookup,
+    decls: Sequence[SwiftDecl],
+):
+    global _format_worker_state
+    _format_worker_state = (manager, swift_lookup, decls)
+
+
+def _format_shard(shard: tuple[int, int]) -> list[tuple[str, int] | None]:
+    assert _format_worker_state is not None
+    manager, swift_lookup, decls = _format_worker_state
+
+    return manager._format_shard(decls, swift_lookup, shard)
+
+
+def _split_shards(decls: Sequence[SwiftDecl], count: int) -> list[tuple[int, int]]:
+    """
+    Splits `decls` into up to `count` contiguous `(start, stop)` ranges with a
+    similar number of nested declarations each.
+    """
+    weights = [len(_flatten_decls([decl])) for decl in decls]
+    target = sum(weights) / count
+
+    result: list[tuple[int, int]] = []
+    start = 0
+    accumulated = 0
+
+    for index, weight in enumerate(weights):
+        accumulated += weight
+
+        if accumulated >= target * (len(result) + 1) or index == len(decls) - 1:
+            result.append((start, index + 1))
+            start = index + 1
+
+    return result
+
+
+def _flatten_decls(decls: Sequence[SwiftDecl]) -> list[SwiftDecl]:
+    """Returns `decls` and all of their nested declarations, in walk order."""
+    result: list[SwiftDecl] = []
+    walker = SwiftDeclWalker(SwiftDeclCallableVisitor(result.append))
+
+    for decl in decls:
+        walker.walk_decl(decl)
+
+    return result
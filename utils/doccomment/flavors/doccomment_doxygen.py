@@ -21,6 +21,18 @@ class DoccommentFlavorDoxygen(DoccommentFlavor):
         self.backtick_word_regex = re.compile(r"\w+")
         self.backtick_cpp_member_regex = re.compile(r"(\w+)::(\w+)")
 
+        # Single-pass rewriting
+        self.command_regex = re.compile(
+            r"[@\\](?:"
+            r"(?P<ref>ref\s)|(?P<brief>brief)|(?P<ingroup>ingroup)"
+            r"|(?P<param>param)|(?P<return>return)|(?P<note>note)"
+            r")"
+        )
+        self.ref_symbol_regex = re.compile(r"\w+(::\w+)*(\(\))?")
+        self.whitespace_regex = re.compile(r"\s+")
+        self.word_regex = re.compile(r"\w+")
+        self.partial_command_regex = re.compile(r"[@\\]\w*\Z")
+
     def doccomment_patterns(self) -> list[str]:
         return [
             "//!<",
@@ -35,6 +47,20 @@ class DoccommentFlavorDoxygen(DoccommentFlavor):
         if comment is None:
             return None
 
+        contents = self._rewrite_commands(comment.comment_contents, lookup)
+        if contents is None:
+            return self._transform_sequentially(comment, lookup)
+
+        return comment.with_contents(contents)
+
+    def _transform_sequentially(
+        self, comment: DoccommentBlock, lookup: SwiftDeclLookup
+    ) -> DoccommentBlock:
+        """
+        Applies each command rewrite to the whole comment, one command at a time.
+        Used for comments where rewriting all commands in a single pass could
+        produce different results.
+        """
         # Replace "\ref <symbol[::symbol...]>" with "`<symbol[.symbol...]>`"
         comment = self.handle_command(
             comment,
@@ -73,6 +99,93 @@ class DoccommentFlavorDoxygen(DoccommentFlavor):
 
         return comment
 
+    def _rewrite_commands(self, contents: str, lookup: SwiftDeclLookup) -> str | None:
+        """
+        Rewrites all Doxygen commands in `contents` in a single left-to-right
+        pass, with the same results as `_transform_sequentially()`.
+
+        Returns `None` if a command removal (`\\brief`, `\\ingroup`) touches
+        other commands, or may form a new command by joining the text around
+        it; in those cases, the outcome depends on the order each command is
+        rewritten, and the comment must be transformed sequentially instead.
+        """
+        # List of (start, end, replacement, is_removal)
+        rewrites: list[tuple[int, int, str | None, bool]] = []
+        skip_ingroups = False
+
+        for command in self.command_regex.finditer(contents):
+            start = command.start()
+            end = command.end()
+            replacement: str | None = None
+
+            match command.lastgroup:
+                case "ref":
+                    if symbol := self.ref_symbol_regex.match(contents, end):
+                        end = symbol.end()
+                        replacement = self.__convert_ref(symbol.group(), lookup)
+                    else:
+                        replacement = self.__convert_ref(None, lookup)
+                case "brief":
+                    if whitespace := self.whitespace_regex.match(contents, end):
+                        end = whitespace.end()
+                    replacement = ""
+                case "ingroup":
+                    newline = contents.find("\n", end)
+                    if newline != -1:
+                        end = newline + 1
+                        replacement = ""
+                    elif start > 0:
+                        replacement = ""
+                    else:
+                        # An '\ingroup' at the start of the comment with no
+                        # line break is kept, along with any that follow.
+                        skip_ingroups = True
+
+                    if skip_ingroups:
+                        replacement = None
+                case "param":
+                    if whitespace := self.whitespace_regex.match(contents, end):
+                        end = whitespace.end()
+                    word = self.word_regex.match(contents, end)
+                    if word is not None:
+                        end = word.end()
+                    replacement = f"- param {word.group() if word else None}:"
+                case "return":
+                    replacement = "- returns:"
+                case "note":
+                    replacement = "- note:"
+
+            rewrites.append((start, end, replacement, replacement == ""))
+
+        if len(rewrites) == 0:
+            return contents
+
+        # Bail out on interacting command removals
+        for index, (start, end, _, is_removal) in enumerate(rewrites):
+            if not is_removal:
+                continue
+            if self.partial_command_regex.search(contents, max(0, start - 8), start):
+                return None
+            if index > 0 and rewrites[index - 1][1] >= start:
+                return None
+            if index + 1 < len(rewrites) and rewrites[index + 1][0] <= end:
+                return None
+
+        result: list[str] = []
+        last_end = 0
+
+        for start, end, replacement, _ in rewrites:
+            if replacement is None:
+                continue
+
+            result.append(contents[last_end:start])
+            result.append(replacement)
+            last_end = end
+
+        result.append(contents[last_end:])
+
+        return "".join(result)
+
     @staticmethod
     def handle_command(
         comment: DoccommentBlock,
@@ -104,22 +217,22 @@ class DoccommentFlavorDoxygen(DoccommentFlavor):
         symbol_name: str | None,
         lookup: SwiftDeclLookup,
     ) -> str | None:
-        def __convert_ref_internal(
-            inner_symbol_name: str | None
-        ) -> str | None:
-            if inner_symbol_name is None:
-                return None
+        def __convert_component(component: str) -> str:
+            # Resolve the symbol at the start of the component, keeping any
+            # trailing text, such as a '()' function call suffix
+            if nearest := lookup.lookup_nearest_c_symbol(component):
+                matched, swift_name = nearest
+                return swift_name + component[len(matched) :]
+
+            return component
 
-            # C++ namespaced symbol references
-            if "::" in inner_symbol_name:
-                split = inner_symbol_name.split("::")
-                replaced = map(lambda s: __convert_ref_internal(s), split)
-                return ".".join([r for r in replaced if r is not None])
+        if symbol_name is None:
+            return f"`{None}`"
 
-            swift_name = lookup.lookup_c_symbol(inner_symbol_name)
-            return swift_name if swift_name is not None else inner_symbol_name
+        # C++ namespaced symbol references are resolved per component
+        converted = map(__convert_component, symbol_name.split("::"))
 
-        return f"`{__convert_ref_internal(symbol_name)}`"
+        return f"`{'.'.join(converted)}`"
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from typing import Mapping
 from utils.converters.swift_type_mapper import SwiftTypeMapper
+from utils.data.swift_decl_lookup import SwiftDeclLookup
 from utils.data.swift_decls import SwiftDecl, SwiftExtensionDecl, SwiftMemberDecl, SwiftMemberFunctionDecl, SwiftMemberVarDecl
 from utils.doccomment.doccomment_block import DoccommentBlock
 
@@ -9,12 +10,19 @@ class SwiftAutoProperty:
     Merges Swift method declarations that form getter/setter patterns into property declarations.
 
     Should be done after all declarations have been named and merged.
+
+    If provided, `lookup` is updated as members are replaced with properties.
     """
-    def __init__(self, type_mapper: SwiftTypeMapper | None = None):
+    def __init__(
+        self,
+        type_mapper: SwiftTypeMapper | None = None,
+        lookup: SwiftDeclLookup | None = None,
+    ):
         if type_mapper is None:
             self.type_mapper = SwiftTypeMapper()
         else:
             self.type_mapper = type_mapper
+        self.lookup = lookup
     
     def convert(self, swift_decls: list[SwiftDecl]) -> list[SwiftDecl]:
         result: list[SwiftDecl] = []
@@ -86,7 +94,9 @@ class SwiftAutoProperty:
                 origin=getter.origin,
                 original_node=getter.original_node,
                 c_kind=getter.c_kind,
-                doccomment=DoccommentBlock.merge(getter.doccomment, setter.doccomment),
+                doccomment=DoccommentBlock.merge_deferrable(
+                    getter.doccomment, setter.doccomment
+                ),
                 is_static=getter.is_static,
                 access_level=getter.access_level,
                 var_type=getter.return_type,
@@ -102,6 +112,10 @@ class SwiftAutoProperty:
 
     def remove_member(self, decl: SwiftMemberDecl, ext: SwiftExtensionDecl):
         ext.members.remove(decl)
+        if self.lookup is not None:
+            self.lookup.remove_decl(decl, parents=[ext])
     
     def add_member(self, decl: SwiftMemberDecl, ext: SwiftExtensionDecl):
         ext.members.append(decl)
+        if self.lookup is not None:
+            self.lookup.add_decl(decl, parents=[ext])
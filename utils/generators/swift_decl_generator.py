@@ -386,11 +386,19 @@ class SwiftDeclGenerator:
         self,
         nodes: list[c_ast.Node],
         ast: c_ast.FileAST,
+        type_mapper: SwiftTypeMapper | None = None,
     ) -> list[SwiftDecl]:
+        """
+        Generates Swift declarations for a list of C nodes from `ast`.
+        If provided, `type_mapper` is expected to have caching enabled for `ast`;
+        otherwise, a new type mapper is created.
+        """
         result = []
 
-        type_mapper = SwiftTypeMapper()
-        type_mapper.enable_caching(ast)
+        if type_mapper is None:
+            type_mapper = SwiftTypeMapper()
+            type_mapper.enable_caching(ast)
+
         context = self.DeclGenerateContext(ast=ast, type_mapper=type_mapper)
 
         for node in nodes:
@@ -400,10 +408,19 @@ class SwiftDeclGenerator:
 
         return result
 
-    def post_merge(self, decls: list[SwiftDecl]) -> list[SwiftDecl]:
-        """Applies post-type merge operations to a list of Swift declarations"""
+    def post_merge(
+        self, decls: list[SwiftDecl], lookup: SwiftDeclLookup | None = None
+    ) -> list[SwiftDecl]:
+        """
+        Applies post-type merge operations to a list of Swift declarations.
+        If provided, `lookup` is expected to contain `decls`, and is updated with
+        the declarations that are synthesized.
+        """
         decls = list(decls)  # Copy internally first
 
+        if lookup is None:
+            lookup = SwiftDeclLookup.from_decls(decls)
+
         def _generate_typealiases(decls: list[SwiftDecl]):
             # Generate typealiases for C symbols, if necessary
             typealiases: list[SwiftDecl] = []
@@ -433,7 +450,11 @@ class SwiftDeclGenerator:
 
             return typealiases
 
-        decls = _generate_typealiases(decls) + decls
+        typealiases = _generate_typealiases(decls)
+        for type_alias in reversed(typealiases):
+            lookup.add_decl(type_alias, first=True)
+
+        decls = typealiases + decls
 
         # Use proposed conformances to generate required members
         for decl in decls:
@@ -444,11 +465,14 @@ class SwiftDeclGenerator:
 
             for conformance in sorted(decl.conformances):
                 if gen := get_conformance_generator(conformance):
-                    decl.members.extend(gen.generate_members(decl, decl.original_node))
+                    members = gen.generate_members(decl, decl.original_node)
+                    decl.members.extend(members)
+
+                    for member in members:
+                        lookup.add_decl(member, parents=[decl])
 
         # Convert types in method/properties signatures to Swift aliased types,
         # if possible
-        lookup = SwiftDeclLookup.from_decls(decls)
         for decl in decls:
             if not isinstance(decl, SwiftExtensionDecl):
                 continue
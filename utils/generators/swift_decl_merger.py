@@ -8,7 +8,7 @@ from utils.data.swift_decls import (
 )
 from pycparser import c_ast
 
-from utils.doccomment.doccomment_block import DoccommentBlock
+from utils.doccomment.doccomment_block import DeferredDoccommentBlock, DoccommentBlock
 
 
 class SwiftDeclMerger:
@@ -177,12 +177,17 @@ class SwiftDeclMerger:
 
     def try_merge_doccomments(
         self,
-        v1: SwiftDecl | DoccommentBlock | None,
-        v2: SwiftDecl | DoccommentBlock | None,
-    ) -> DoccommentBlock | None:
+        v1: SwiftDecl | DoccommentBlock | DeferredDoccommentBlock | None,
+        v2: SwiftDecl | DoccommentBlock | DeferredDoccommentBlock | None,
+    ) -> DoccommentBlock | DeferredDoccommentBlock | None:
         c1 = v1.doccomment if isinstance(v1, SwiftDecl) else v1
         c2 = v2.doccomment if isinstance(v2, SwiftDecl) else v2
 
+        return DeferredDoccommentBlock.combine(c1, c2, self._merge_doccomments)
+
+    def _merge_doccomments(
+        self, c1: DoccommentBlock | None, c2: DoccommentBlock | None
+    ) -> DoccommentBlock | None:
         if c1 is None:
             return c2
         if c2 is None:
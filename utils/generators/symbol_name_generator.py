@@ -1,3 +1,4 @@
+from utils.collection.lru_cache import LRUCache
 from utils.converters.symbol_name_formatter import SymbolNameFormatter
 from utils.data.c_decl_kind import CDeclKind
 from utils.data.compound_symbol_name import CompoundSymbolName
@@ -8,19 +9,37 @@ class SymbolNameGenerator:
     formatter: SymbolNameFormatter
     symbol_casting_settings: GeneratorConfig.Declarations.SymbolCasingSettings
 
+    cache_size: int | None
+    "Maximum number of names cached for each kind of C declaration."
+
+    caches: dict[
+        CDeclKind,
+        LRUCache[
+            tuple[str, GeneratorConfig.Declarations.SymbolCasing], CompoundSymbolName
+        ],
+    ]
+    """
+    Generated names for each kind of C declaration, keyed by the C name and the
+    symbol casing it was read with.
+    """
+
     def __init__(
         self,
         formatter: SymbolNameFormatter,
         symbol_casting_settings: GeneratorConfig.Declarations.SymbolCasingSettings,
+        cache_size: int | None = 4096,
     ):
         self.formatter = formatter
         self.symbol_casting_settings = symbol_casting_settings
+        self.cache_size = cache_size
+        self.caches = dict()
 
     @classmethod
     def from_config(cls, config: GeneratorConfig.Declarations):
         return cls(
             formatter=SymbolNameFormatter.from_config(config.formatter),
             symbol_casting_settings=config.symbol_casing_settings,
+            cache_size=config.symbol_name_cache_size,
         )
 
     def generate_from_symbol_casing(
@@ -29,9 +48,37 @@ class SymbolNameGenerator:
         casing: GeneratorConfig.Declarations.SymbolCasing,
         c_decl_kind: CDeclKind,
     ) -> CompoundSymbolName:
-        return self.formatter.format(
+        cache = self.caches.get(c_decl_kind)
+        if cache is None:
+            cache = self.caches[c_decl_kind] = LRUCache(self.cache_size)
+
+        key = (name, casing)
+
+        if (cached := cache.get(key)) is not None:
+            return cached
+
+        result = self.formatter.format(
             compound_symbol_with_casing(name, casing), c_decl_kind
         )
+        cache.put(key, result)
+
+        return result
+
+    def cache_counters(self) -> dict[str, int]:
+        """
+        Returns the number of cache hits and misses of each kind of C
+        declaration, e.g. `{"symbol_names.enum.hits": 3, "symbol_names.enum.misses": 1}`.
+        """
+        result: dict[str, int] = dict()
+
+        for kind, cache in self.caches.items():
+            result[f"symbol_names.{kind.name.lower()}.hits"] = cache.hits
+            result[f"symbol_names.{kind.name.lower()}.misses"] = cache.misses
+
+        return result
+
+    def clear_cache(self):
+        self.caches.clear()
 
     def generate_enum_name(self, name: str) -> CompoundSymbolName:
         return self.generate_from_symbol_casing(
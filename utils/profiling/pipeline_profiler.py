@@ -0,0 +1,191 @@
+import cProfile
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(slots=True)
+class StageProfile:
+    """Measurements collected for a single run of a pipeline stage."""
+
+    name: str
+    "Name of the stage."
+
+    wall_time_ns: int
+    "Elapsed wall-clock time, in nanoseconds."
+
+    cpu_time_ns: int
+    "CPU time spent by the process (user + system), in nanoseconds."
+
+    peak_memory_bytes: int | None
+    """
+    Peak size of memory blocks traced by `tracemalloc` during the stage, or
+    `None` if memory tracing was disabled.
+    """
+
+    memory_delta_bytes: int | None
+    """
+    Difference between the traced memory before and after the stage, or `None`
+    if memory tracing was disabled.
+    """
+
+    cprofile_path: Path | None = None
+    "Path of the cProfile dump of this stage, if one was requested."
+
+    def to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "wall_time_ns": self.wall_time_ns,
+            "cpu_time_ns": self.cpu_time_ns,
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "memory_delta_bytes": self.memory_delta_bytes,
+            "cprofile_path": (
+                str(self.cprofile_path) if self.cprofile_path is not None else None
+            ),
+        }
+
+
+class PipelineProfiler:
+    """
+    Records wall time, CPU time and peak memory usage for each stage of the type
+    generation pipeline.
+
+    ```python
+    profiler = PipelineProfiler()
+    with profiler.stage("parse"):
+        ...
+    profiler.record_counters({"cache.hits": 10, "cache.misses": 2})
+    profiler.write_report(Path("profile.json"))
+    ```
+
+    A disabled profiler can be used as a no-op stand-in, where `stage()` records
+    nothing.
+    """
+
+    enabled: bool
+    trace_memory: bool
+    "Whether to trace memory allocations with `tracemalloc`. Slows down the stages considerably."
+
+    cprofile_dir: Path | None
+    "If not `None`, a cProfile dump of each stage is written to this folder."
+
+    stages: list[StageProfile]
+
+    counters: dict[str, int]
+    "Named counts reported by the stages, such as cache hits and misses."
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        trace_memory: bool = True,
+        cprofile_dir: Path | None = None,
+    ):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.cprofile_dir = cprofile_dir
+        self.stages = []
+        self.counters = dict()
+
+    @classmethod
+    def disabled(cls) -> "PipelineProfiler":
+        return cls(enabled=False)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measures the code executed within this context as a stage named `name`."""
+        if not self.enabled:
+            yield
+            return
+
+        started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        memory_before = 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+        profile: cProfile.Profile | None = None
+        if self.cprofile_dir is not None:
+            profile = cProfile.Profile()
+
+        cpu_start = time.process_time_ns()
+        wall_start = time.perf_counter_ns()
+
+        try:
+            if profile is not None:
+                profile.enable()
+
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+
+            wall_time = time.perf_counter_ns() - wall_start
+            cpu_time = time.process_time_ns() - cpu_start
+
+            peak_memory: int | None = None
+            memory_delta: int | None = None
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak_memory = peak
+                memory_delta = current - memory_before
+
+                if started_tracing:
+                    tracemalloc.stop()
+
+            result = StageProfile(
+                name=name,
+                wall_time_ns=wall_time,
+                cpu_time_ns=cpu_time,
+                peak_memory_bytes=peak_memory,
+                memory_delta_bytes=memory_delta,
+            )
+
+            if profile is not None and self.cprofile_dir is not None:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                result.cprofile_path = self.cprofile_dir.joinpath(
+                    f"{len(self.stages):02d}-{name}.prof"
+                )
+                profile.dump_stats(result.cprofile_path)
+
+            self.stages.append(result)
+
+    def record_counters(self, counters: dict[str, int]):
+        """Records named counts, replacing any previously recorded count with the same name."""
+        if not self.enabled:
+            return
+
+        self.counters.update(counters)
+
+    def total_wall_time_ns(self) -> int:
+        return sum(stage.wall_time_ns for stage in self.stages)
+
+    def total_cpu_time_ns(self) -> int:
+        return sum(stage.cpu_time_ns for stage in self.stages)
+
+    def to_json(self) -> dict:
+        return {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "total_wall_time_ns": self.total_wall_time_ns(),
+            "total_cpu_time_ns": self.total_cpu_time_ns(),
+            "stages": [stage.to_json() for stage in self.stages],
+            "counters": dict(self.counters),
+        }
+
+    def write_report(self, path: Path):
+        """Writes the collected measurements as a JSON file to `path`."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w", newline="\n") as file:
+            json.dump(self.to_json(), file, indent=2)
+            file.write("\n")
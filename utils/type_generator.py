@@ -5,16 +5,20 @@ import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
 
-import pycparser
 from pycparser import c_ast
 
+from utils.cache.ast_cache import AstCache, parse_file_cached
+from utils.cache.doccomment_index_cache import DoccommentIndexCache
+from utils.cache.preprocessor_cache import PreprocessorCache
 from utils.cli.cli_printing import print_stage_name
 from utils.cli.console_color import ConsoleColor
+from utils.converters.swift_type_mapper import SwiftTypeMapper
 from utils.data.generator_config import GeneratorConfig
 from utils.data.swift_decl_lookup import SwiftDeclLookup
 from utils.data.swift_decl_visitor import SwiftDeclVisitor
@@ -26,7 +30,9 @@ from utils.data.swift_file import SwiftFile
 from utils.directory_structure.directory_structure_manager import (
     DirectoryStructureManager,
 )
+from utils.doccomment.doccomment_block import resolve_doccomment
 from utils.doccomment.doccomment_formatter import DoccommentFormatter
+from utils.doccomment.doccomment_lookup import DoccommentLookup
 from utils.doccomment.doccomment_manager import DoccommentManager
 from utils.generators.swift_auto_property import SwiftAutoProperty
 from utils.generators.swift_decl_generator import SwiftDeclGenerator
@@ -36,10 +42,14 @@ from utils.generators.symbol_name_generator import SymbolNameGenerator
 
 # Utils
 from utils.paths import paths
+from utils.profiling.pipeline_profiler import PipelineProfiler
 from utils.text.syntax_stream import SyntaxStream
+from utils.utils.file_utils import sha256_bytes, write_bytes_atomic
 
 
-def run_cl(input_path: Path, extra_args: list[str] | None = None) -> bytes:
+def cl_args(
+    input_path: Path, extra_args: list[str] | None = None
+) -> list[str | os.PathLike]:
     args: list[str | os.PathLike] = [
         "cl",
         "/E",
@@ -50,10 +60,12 @@ def run_cl(input_path: Path, extra_args: list[str] | None = None) -> bytes:
     if extra_args is not None:
         args.extend(extra_args)
 
-    return subprocess.check_output(args, cwd=paths.SCRIPTS_ROOT_PATH)
+    return args
 
 
-def run_clang(input_path: Path, extra_args: list[str] | None = None) -> bytes:
+def clang_args(
+    input_path: Path, extra_args: list[str] | None = None
+) -> list[str | os.PathLike]:
     args: list[str | os.PathLike] = [
         "clang",
         "-E",
@@ -65,14 +77,52 @@ def run_clang(input_path: Path, extra_args: list[str] | None = None) -> bytes:
     if extra_args is not None:
         args.extend(extra_args)
 
-    return subprocess.check_output(args, cwd=paths.SCRIPTS_ROOT_PATH)
+    return args
 
 
-def run_c_preprocessor(input_path: Path, extra_args: list[str] | None = None) -> bytes:
+def c_preprocessor_args(
+    input_path: Path, extra_args: list[str] | None = None
+) -> list[str | os.PathLike]:
     if sys.platform == "win32":
-        return run_cl(input_path, extra_args)
+        return cl_args(input_path, extra_args)
+
+    return clang_args(input_path, extra_args)
+
+
+def run_cl(input_path: Path, extra_args: list[str] | None = None) -> bytes:
+    return subprocess.check_output(
+        cl_args(input_path, extra_args), cwd=paths.SCRIPTS_ROOT_PATH
+    )
+
+
+def run_clang(input_path: Path, extra_args: list[str] | None = None) -> bytes:
+    return subprocess.check_output(
+        clang_args(input_path, extra_args), cwd=paths.SCRIPTS_ROOT_PATH
+    )
+
+
+def run_c_preprocessor(
+    input_path: Path,
+    extra_args: list[str] | None = None,
+    cache: PreprocessorCache | None = None,
+) -> bytes:
+    """
+    Runs the platform's C preprocessor over `input_path`, returning its output.
+    If `cache` is provided, a previously cached output is returned instead, if
+    none of the files that produced it have changed since.
+    """
+    args = c_preprocessor_args(input_path, extra_args)
+    cwd = paths.SCRIPTS_ROOT_PATH
 
-    return run_clang(input_path, extra_args)
+    if cache is not None and (cached := cache.fetch(args, cwd)) is not None:
+        return cached
+
+    output = subprocess.check_output(args, cwd=cwd)
+
+    if cache is not None:
+        cache.store(args, cwd, output)
+
+    return output
 
 
 class DeclGeneratorTarget:
@@ -80,8 +130,21 @@ class DeclGeneratorTarget:
         pass
 
     def write_file(self, file: SwiftFile):
-        with self.create_stream(file.path) as stream:
-            file.write(stream)
+        self.write_rendered_file(file.path, file.render())
+
+    def write_rendered_files(self, rendered: Sequence[tuple[Path, str]]):
+        """Writes a batch of pre-rendered files, in order, to this target."""
+        for path, contents in rendered:
+            self.write_rendered_file(path, contents)
+
+    def write_rendered_file(self, path: Path, contents: str):
+        """Writes the pre-rendered contents of a file at `path` to this target."""
+        with self.create_stream(path) as stream:
+            stream.write(contents)
+
+    def finish(self):
+        """Called once all files have been written to this target."""
+        pass
 
     @contextmanager
     def create_stream(self, _: Path):
@@ -107,13 +170,80 @@ class DeclFileGeneratorDiskTarget(DeclGeneratorTarget):
             shutil.rmtree(self.destination_folder)
             os.mkdir(self.destination_folder)
 
-    @contextmanager
-    def create_stream(self, path: Path):
-        path.parent.mkdir(parents=True, exist_ok=True)
+    def write_rendered_file(self, path: Path, contents: str):
+        write_bytes_atomic(path, contents.encode("utf-8"))
+
 
-        with open(path, "w", buffering=1, newline="\n") as file:
-            stream = SyntaxStream(file)
-            yield stream
+class DeclFileGeneratorIncrementalDiskTarget(DeclFileGeneratorDiskTarget):
+    """
+    A disk target that renders files in memory and only writes the ones whose
+    contents differ from what is on disk, removing any previously generated
+    .swift file that was not produced again.
+
+    Files that did not change keep their modification dates, which allows
+    incremental Swift builds to skip recompiling them.
+    """
+
+    written_paths: set[Path]
+    "Resolved paths of the files that were produced since `prepare()`."
+
+    def __init__(self, destination_folder: Path, verbose: bool = True):
+        super().__init__(destination_folder, rm_folder=False, verbose=verbose)
+        self.written_paths = set()
+        self.num_updated = 0
+        self.num_removed = 0
+
+    def prepare(self):
+        super().prepare()
+
+        self.destination_folder.mkdir(parents=True, exist_ok=True)
+        self.written_paths = set()
+        self.num_updated = 0
+        self.num_removed = 0
+
+    def write_rendered_file(self, path: Path, contents: str):
+        self.written_paths.add(path.resolve())
+
+        if self._read_existing(path) == contents:
+            return
+
+        super().write_rendered_file(path, contents)
+
+        self.num_updated += 1
+
+    def finish(self):
+        for path in sorted(self.destination_folder.rglob("*.swift")):
+            if path.resolve() in self.written_paths:
+                continue
+
+            path.unlink()
+            self.num_removed += 1
+
+            if self.verbose:
+                rel_path = path.relative_to(self.destination_folder)
+                print(f"Removed {ConsoleColor.MAGENTA(rel_path)}")
+
+        # Remove folders left empty by removed files
+        for folder in sorted(
+            (p for p in self.destination_folder.rglob("*") if p.is_dir()),
+            key=lambda p: len(p.parts),
+            reverse=True,
+        ):
+            if not any(folder.iterdir()):
+                folder.rmdir()
+
+        if self.verbose:
+            num_unchanged = len(self.written_paths) - self.num_updated
+            print(
+                f"Updated {ConsoleColor.GREEN(self.num_updated)} file(s), {ConsoleColor.GREEN(num_unchanged)} unchanged, {ConsoleColor.GREEN(self.num_removed)} removed"
+            )
+
+    def _read_existing(self, path: Path) -> str | None:
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
 
 
 class DeclFileGeneratorStdoutTarget(DeclGeneratorTarget):
@@ -150,21 +280,40 @@ class DeclFileGenerator:
 
         for file in files:
             file.includes = self.includes
-            self.target.write_file(file)
 
-            if self.verbose:
+        rendered = self.render_files(files)
+
+        self.target.write_rendered_files(
+            [(file.path, contents) for file, contents in zip(files, rendered)]
+        )
+
+        if self.verbose:
+            for file in files:
                 rel_path = file.path.relative_to(self.destination_folder)
                 print(
                     f"Generated {ConsoleColor.MAGENTA(rel_path)} with {ConsoleColor.CYAN(len(file.decls))} declaration(s)"
                 )
 
+        self.target.finish()
+
+    def render_files(self, files: Sequence[SwiftFile]) -> list[str]:
+        """
+        Renders the contents of each file in `files`, returning them in the same
+        order.
+
+        Files are rendered in this process: sending the declarations of a file
+        to a worker process costs several times more than rendering it.
+        """
+        return [file.render() for file in files]
+
 
 # noinspection PyPep8Naming
 class DeclCollectorVisitor(c_ast.NodeVisitor):
-    decls: list[c_ast.Node] = []
+    decls: list[c_ast.Node]
 
     def __init__(self, prefixes: list[str]):
         self.prefixes = prefixes
+        self.decls = []
 
     def should_include(self, decl_name: str) -> bool:
         for prefix in self.prefixes:
@@ -195,6 +344,23 @@ class DeclCollectorVisitor(c_ast.NodeVisitor):
 
         return decl.declname
 
+    def unique_decls(self, seen: set[tuple[type, str]]) -> list[c_ast.Node]:
+        """
+        Returns the collected declarations whose kind and source location are
+        not in `seen`, adding the ones returned to `seen`.
+        """
+        result = []
+
+        for decl in self.decls:
+            key = (type(decl), str(decl.coord))
+            if key in seen:
+                continue
+
+            seen.add(key)
+            result.append(decl)
+
+        return result
+
 
 class SwiftDoccommentFormatterVisitor(SwiftDeclVisitor):
     def __init__(self, formatter: DoccommentFormatter, lookup: SwiftDeclLookup):
@@ -203,7 +369,7 @@ class SwiftDoccommentFormatterVisitor(SwiftDeclVisitor):
 
     def generic_visit(self, decl: SwiftDecl) -> SwiftDeclVisitResult:
         decl.doccomment = self.formatter.format_doccomment(
-            decl.doccomment, decl, self.lookup
+            resolve_doccomment(decl.doccomment), decl, self.lookup
         )
 
         return SwiftDeclVisitResult.VISIT_CHILDREN
@@ -211,7 +377,8 @@ class SwiftDoccommentFormatterVisitor(SwiftDeclVisitor):
 
 @dataclass
 class TypeGeneratorRequest:
-    header_file: Path
+    header_files: list[Path]
+    "Header files to use as entry points. Each header file is preprocessed and parsed as a separate translation unit."
     extra_compiler_args: list[str] | None
     destination: Path
     prefixes: list[str]
@@ -223,12 +390,20 @@ class TypeGeneratorRequest:
     doccomment_manager: DoccommentManager
     directory_manager: DirectoryStructureManager
     swift_decl_generator: SwiftDeclGenerator
+    cache_dir: Path | None = None
+    "Directory to store persistent caches in between runs. Caching is disabled if `None`."
+    profiler: PipelineProfiler | None = None
+    "Profiler to record the duration of each stage of the generation with, if any."
+    jobs: int = 1
+    "Maximum number of worker processes to use for stages that support running in parallel."
+    preprocessed_dir: Path | None = None
+    "Folder to write the preprocessed output of each header file to. If `None`, outputs are written next to each header file."
 
     @classmethod
     def from_config(
         cls,
         config: GeneratorConfig,
-        header_file: Path,
+        header_files: list[Path],
         target: DeclGeneratorTarget,
         file_header: str = "",
     ):
@@ -243,7 +418,7 @@ class TypeGeneratorRequest:
             directory_manager.global_header_lines.append(file_header)
 
         return cls(
-            header_file=header_file,
+            header_files=header_files,
             extra_compiler_args=None,
             destination=destination,
             prefixes=prefixes,
@@ -258,6 +433,108 @@ class TypeGeneratorRequest:
         )
 
 
+class TypeGeneratorSession:
+    """
+    State kept in memory between consecutive requests issued by a long-running
+    process, such as `generate_types.py --watch`, allowing work that depends
+    only on inputs that did not change to be skipped on subsequent runs.
+    """
+
+    asts: dict[tuple, c_ast.FileAST]
+    "ASTs parsed by previous requests, keyed by the header file and compiler arguments they were produced from."
+
+    type_mappers: dict[tuple, SwiftTypeMapper]
+    "Type mappers with typedef lookups cached from each AST in `asts`."
+
+    doccomment_lookup: DoccommentLookup | None
+    "Doc comment lookup with the doc comments of each header file cached."
+
+    def __init__(self):
+        self.asts = dict()
+        self.type_mappers = dict()
+        self.doccomment_lookup = None
+
+    def invalidate_headers(self, changed_paths: Iterable[Path]):
+        """
+        Invalidates state derived from C header files, after the files at
+        `changed_paths` have been modified.
+        """
+        # Any translation unit may include the changed headers
+        self.asts.clear()
+        self.type_mappers.clear()
+
+        if self.doccomment_lookup is not None:
+            self.doccomment_lookup.invalidate(changed_paths)
+
+    def load_asts(
+        self, request: TypeGeneratorRequest, profiler: PipelineProfiler | None = None
+    ) -> list[c_ast.FileAST]:
+        """
+        Returns the ASTs for the header files of `request`, reusing ASTs from
+        previous runs that were parsed from the same inputs.
+        """
+        keys = [_ast_key(request, header_file) for header_file in request.header_files]
+        missing = [
+            header_file
+            for header_file, key in zip(request.header_files, keys)
+            if key not in self.asts
+        ]
+
+        if len(missing) < len(keys):
+            print_stage_name("Header files unchanged; reusing parsed header file...")
+
+        if len(missing) > 0:
+            asts = _parse_header_files(
+                request, missing, profiler or PipelineProfiler.disabled()
+            )
+
+            for header_file, ast in zip(missing, asts):
+                key = _ast_key(request, header_file)
+                self.asts[key] = ast
+                self.type_mappers.pop(key, None)
+
+        return [self.asts[key] for key in keys]
+
+    def type_mapper_for(
+        self, request: TypeGeneratorRequest, header_file: Path
+    ) -> SwiftTypeMapper | None:
+        """
+        Returns a type mapper with caching enabled for the AST of `header_file`,
+        reusing the one from previous runs, if possible.
+        """
+        key = _ast_key(request, header_file)
+        if (ast := self.asts.get(key)) is None:
+            return None
+
+        if (type_mapper := self.type_mappers.get(key)) is None:
+            type_mapper = SwiftTypeMapper()
+            type_mapper.enable_caching(ast)
+            self.type_mappers[key] = type_mapper
+
+        return type_mapper
+
+    def doccomment_lookup_for(self, lookup: DoccommentLookup) -> DoccommentLookup:
+        """
+        Returns the doc comment lookup from previous runs, if it is configured
+        with the same patterns as `lookup`, or adopts `lookup` otherwise.
+        """
+        if (
+            self.doccomment_lookup is None
+            or self.doccomment_lookup.doccomment_patterns
+            != lookup.doccomment_patterns
+        ):
+            self.doccomment_lookup = lookup
+
+        return self.doccomment_lookup
+
+
+def _ast_key(request: TypeGeneratorRequest, header_file: Path) -> tuple:
+    return (
+        header_file.resolve(),
+        tuple(request.extra_compiler_args or []),
+    )
+
+
 class _SwiftDeclCounterVisitor(SwiftDeclVisitor):
     num_extensions = 0
     num_typealiases = 0
@@ -344,44 +621,222 @@ def _label_time_ns(ns):
         return "%d.%ds" % (seconds, ms)
 
 
-def generate_types(request: TypeGeneratorRequest) -> int:
+def _file_has_contents(path: Path, contents: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(contents):
+            return False
+
+        with open(path, "rb") as f:
+            return f.read() == contents
+    except OSError:
+        return False
+
+
+def generate_types(
+    request: TypeGeneratorRequest, session: TypeGeneratorSession | None = None
+) -> int:
     start = time.perf_counter_ns()
-    result = _generate_types(request)
+    result = _generate_types(request, session)
     duration = time.perf_counter_ns() - start
 
     print(f"Completed request in: {_label_time_ns(duration)}")
 
+    if request.profiler is not None and request.profiler.enabled:
+        _print_profile(request.profiler)
+
     return result
 
 
-def _generate_types(request: TypeGeneratorRequest) -> int:
-    print_stage_name("Generating header file...")
+def _print_profile(profiler: PipelineProfiler):
+    print_stage_name("Profile:")
 
-    output_file = run_c_preprocessor(request.header_file, request.extra_compiler_args)
+    for stage in profiler.stages:
+        memory = ""
+        if stage.peak_memory_bytes is not None:
+            memory = f", peak memory {ConsoleColor.CYAN(f'{stage.peak_memory_bytes / 1024:0.1f}KiB')}"
 
-    # Windows-specific fix to replace some page feeds that are present in the original system headers
-    if sys.platform == "win32":
-        output_file = output_file.replace(b"\x0c", b"")
+        print(
+            f"  > {stage.name}: {ConsoleColor.GREEN(_label_time_ns(stage.wall_time_ns))} wall, {ConsoleColor.GREEN(_label_time_ns(stage.cpu_time_ns))} CPU{memory}"
+        )
 
-    output_path = request.header_file.with_suffix(".i")
-    with open(output_path, "wb") as f:
-        f.write(output_file)
+    for name, count in profiler.counters.items():
+        print(f"  > {name}: {ConsoleColor.CYAN(count)}")
+
+
+def parse_translation_unit(
+    header_file: Path,
+    extra_compiler_args: list[str] | None,
+    preprocessed_path: Path,
+    cache_dir: Path | None = None,
+    profiler: PipelineProfiler | None = None,
+    verbose: bool = True,
+    ast_cache_entries: int = 4,
+) -> c_ast.FileAST:
+    """
+    Preprocesses a header file, writing the output to `preprocessed_path`, and
+    parses the result.
+
+    `ast_cache_entries` is the maximum number of parsed ASTs kept in the cache
+    in `cache_dir`, across every translation unit.
+    """
+    if profiler is None:
+        profiler = PipelineProfiler.disabled()
+
+    if verbose:
+        print_stage_name("Generating header file...")
+
+    preprocessor_cache: PreprocessorCache | None = None
+    ast_cache: AstCache | None = None
+    if cache_dir is not None:
+        preprocessor_cache = PreprocessorCache(cache_dir)
+        ast_cache = AstCache(cache_dir, max_entries=ast_cache_entries)
+
+    with profiler.stage("preprocess"):
+        output_file = run_c_preprocessor(
+            header_file, extra_compiler_args, preprocessor_cache
+        )
+
+        # Windows-specific fix to replace some page feeds that are present in the original system headers
+        if sys.platform == "win32":
+            output_file = output_file.replace(b"\x0c", b"")
+
+        if not _file_has_contents(preprocessed_path, output_file):
+            preprocessed_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(preprocessed_path, "wb") as f:
+                f.write(output_file)
+
+    if verbose:
+        print_stage_name(
+            f"Parsing generated header file '{ConsoleColor.CYAN(preprocessed_path.name)}'..."
+        )
+
+    with profiler.stage("parse"):
+        return parse_file_cached(preprocessed_path, output_file, ast_cache)
+
+
+def _preprocessed_path(request: TypeGeneratorRequest, header_file: Path) -> Path:
+    if request.preprocessed_dir is None:
+        return header_file.with_suffix(".i")
+
+    name = header_file.with_suffix(".i").name
+
+    # Headers that share a file name would otherwise write to the same file
+    if sum(other.name == header_file.name for other in request.header_files) > 1:
+        digest = sha256_bytes(str(header_file.resolve()).encode())[:12]
+        name = f"{header_file.stem}-{digest}.i"
+
+    return request.preprocessed_dir.joinpath(name)
+
+
+def _ast_cache_entries(request: TypeGeneratorRequest) -> int:
+    """
+    Returns the number of parsed ASTs to keep cached for the translation units
+    of a request: room for the current and the previous AST of each unit, so
+    units that did not change are not evicted by the ones that did.
+    """
+    return max(4, 2 * len(request.header_files))
+
+
+def _parse_header_files(
+    request: TypeGeneratorRequest,
+    header_files: list[Path],
+    profiler: PipelineProfiler,
+) -> list[c_ast.FileAST]:
+    """
+    Preprocesses and parses each header file as a separate translation unit,
+    across a pool of worker processes if `request.jobs > 1`.
+    """
+    if request.jobs <= 1 or len(header_files) <= 1:
+        return [
+            parse_translation_unit(
+                header_file,
+                request.extra_compiler_args,
+                _preprocessed_path(request, header_file),
+                request.cache_dir,
+                profiler,
+                ast_cache_entries=_ast_cache_entries(request),
+            )
+            for header_file in header_files
+        ]
 
+    workers = min(request.jobs, len(header_files))
     print_stage_name(
-        f"Parsing generated header file '{ConsoleColor.CYAN(output_path.name)}'..."
+        f"Parsing {ConsoleColor.CYAN(len(header_files))} header files with {ConsoleColor.CYAN(workers)} worker(s)..."
     )
 
-    ast = pycparser.parse_file(output_path, use_cpp=False)
+    with profiler.stage("preprocess_and_parse"):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    parse_translation_unit,
+                    header_file,
+                    request.extra_compiler_args,
+                    _preprocessed_path(request, header_file),
+                    request.cache_dir,
+                    verbose=False,
+                    ast_cache_entries=_ast_cache_entries(request),
+                )
+                for header_file in header_files
+            ]
+
+            return [future.result() for future in futures]
+
+
+def _generate_types(
+    request: TypeGeneratorRequest, session: TypeGeneratorSession | None = None
+) -> int:
+    profiler = (
+        request.profiler
+        if request.profiler is not None
+        else PipelineProfiler.disabled()
+    )
+
+    asts: list[c_ast.FileAST]
+    type_mappers: list[SwiftTypeMapper | None]
+
+    if session is not None:
+        asts = session.load_asts(request, profiler)
+        type_mappers = [
+            session.type_mapper_for(request, header_file)
+            for header_file in request.header_files
+        ]
+        request.doccomment_manager.lookup = session.doccomment_lookup_for(
+            request.doccomment_manager.lookup
+        )
+    else:
+        asts = _parse_header_files(request, request.header_files, profiler)
+        type_mappers = [None] * len(asts)
+
+    lookup = request.doccomment_manager.lookup
+    if request.cache_dir is not None and lookup.index_cache is None:
+        lookup.index_cache = DoccommentIndexCache(request.cache_dir)
 
     # Collect symbols
 
     print_stage_name("Collecting Swift symbol candidates...")
 
-    visitor = DeclCollectorVisitor(prefixes=request.prefixes)
-    visitor.visit(ast)
+    with profiler.stage("collect"):
+        # Declarations from headers that are included by multiple translation
+        # units are only collected from the first unit they appear in.
+        seen_decls: set[tuple[type, str]] = set()
+        unit_decls: list[list[c_ast.Node]] = []
+
+        for ast in asts:
+            visitor = DeclCollectorVisitor(prefixes=request.prefixes)
+            visitor.visit(ast)
+
+            unit_decls.append(visitor.unique_decls(seen_decls))
 
     decl_generator = request.swift_decl_generator
-    swift_decls = decl_generator.generate_from_list(visitor.decls, ast)
+    with profiler.stage("decl_generation"):
+        swift_decls: list[SwiftDecl] = []
+
+        for ast, decls, type_mapper in zip(asts, unit_decls, type_mappers):
+            swift_decls.extend(
+                decl_generator.generate_from_list(decls, ast, type_mapper)
+            )
+
+    profiler.record_counters(decl_generator.symbol_name_generator.cache_counters())
 
     # Report number of symbols found
 
@@ -405,20 +860,26 @@ def _generate_types(request: TypeGeneratorRequest) -> int:
 
     if request.doccomment_manager.should_collect:
         print_stage_name("Generating doc comments...")
-        request.doccomment_manager.populate(swift_decls)
+        with profiler.stage("doc_comments"):
+            request.doccomment_manager.populate(swift_decls, request.jobs)
 
     # Merge symbols
 
     print_stage_name("Merging/synthesizing on generated Swift type declarations...")
 
-    merger = SwiftDeclMerger()
-    swift_decls = merger.merge(swift_decls)
-    swift_decls = decl_generator.post_merge(swift_decls)
+    with profiler.stage("merge"):
+        merger = SwiftDeclMerger()
+        swift_decls = merger.merge(swift_decls)
+
+        # Kept up to date by the following stages as declarations are synthesized
+        swift_lookup = SwiftDeclLookup.from_decls(swift_decls)
+        swift_decls = decl_generator.post_merge(swift_decls, swift_lookup)
 
     if request.auto_property:
         print_stage_name("Detecting properties...")
-        auto_prop = SwiftAutoProperty()
-        swift_decls = auto_prop.convert(swift_decls)
+        with profiler.stage("auto_property"):
+            auto_prop = SwiftAutoProperty(lookup=swift_lookup)
+            swift_decls = auto_prop.convert(swift_decls)
 
     count_visitor.reset()
     count_visitor.walk_all(swift_decls)
@@ -434,21 +895,25 @@ def _generate_types(request: TypeGeneratorRequest) -> int:
     if request.doccomment_manager.should_format:
         print_stage_name("Formatting doc comments...")
 
-        request.doccomment_manager.format(swift_decls)
+        with profiler.stage("format"):
+            request.doccomment_manager.format(
+                swift_decls, request.jobs, swift_lookup
+            )
 
     # Save declaration to files
 
     print_stage_name("Generating files...")
 
-    generator = DeclFileGenerator(
-        request.destination,
-        request.target,
-        swift_decls,
-        request.includes,
-        request.directory_manager,
-        verbose=True,
-    )
-    generator.generate()
+    with profiler.stage("emit"):
+        generator = DeclFileGenerator(
+            request.destination,
+            request.target,
+            swift_decls,
+            request.includes,
+            request.directory_manager,
+            verbose=True,
+        )
+        generator.generate()
 
     # Warn about entries in type protocol conformance entries that where not matched
     # against a type
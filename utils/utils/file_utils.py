@@ -0,0 +1,44 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+
+def sha256_bytes(data: bytes) -> str:
+    """Returns the hex-encoded SHA-256 digest of a given byte buffer."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    """Returns the hex-encoded SHA-256 digest of the contents of the file at `path`."""
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def write_bytes_atomic(path: Path, data: bytes):
+    """
+    Writes `data` to `path` by first writing to a temporary file in the same
+    directory and then renaming it over `path`, so readers never observe a
+    partially-written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+
+        # mkstemp() creates files readable only by the owner; keep the mode of
+        # the file being replaced, or use a regular file mode otherwise.
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
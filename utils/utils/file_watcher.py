@@ -0,0 +1,99 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class _FileState:
+    size: int
+    mtime_ns: int
+
+
+class FileWatcher:
+    """
+    Watches a set of files for modifications by periodically polling their
+    sizes and modification dates.
+
+    Files are provided either as explicit paths, or as `(folder, glob pattern)`
+    pairs, which are re-evaluated on every poll so that files added or removed
+    from a folder are also reported.
+    """
+
+    paths: list[Path]
+    "Explicit file paths to watch."
+
+    globs: list[tuple[Path, str]]
+    "Folders and glob patterns of files within them to watch."
+
+    _states: dict[Path, _FileState]
+
+    def __init__(
+        self,
+        paths: Iterable[Path] = (),
+        globs: Iterable[tuple[Path, str]] = (),
+    ):
+        self.paths = [path.resolve() for path in paths]
+        self.globs = [(folder.resolve(), pattern) for folder, pattern in globs]
+        self._states = self._snapshot()
+
+    def watched_files(self) -> list[Path]:
+        """Returns the resolved paths of all files currently being watched."""
+        result: dict[Path, None] = dict.fromkeys(self.paths)
+
+        for folder, pattern in self.globs:
+            result.update(dict.fromkeys(sorted(folder.glob(pattern))))
+
+        return list(result)
+
+    def poll(self) -> set[Path]:
+        """
+        Returns the files that were created, modified or removed since the last
+        call to `poll()`, or since this watcher was created.
+        """
+        states = self._snapshot()
+
+        changed = {
+            path
+            for path in states.keys() | self._states.keys()
+            if states.get(path) != self._states.get(path)
+        }
+
+        self._states = states
+
+        return changed
+
+    def wait_for_changes(
+        self, interval: float = 0.5, settle_time: float = 0.2
+    ) -> set[Path]:
+        """
+        Blocks until at least one watched file changes, returning the set of
+        changed files.
+
+        After the first change is detected, polling continues until no further
+        changes are seen for `settle_time` seconds, so that files saved in quick
+        succession are reported together.
+        """
+        while not (changed := self.poll()):
+            time.sleep(interval)
+
+        while True:
+            time.sleep(settle_time)
+
+            if not (more := self.poll()):
+                return changed
+
+            changed |= more
+
+    def _snapshot(self) -> dict[Path, _FileState]:
+        result: dict[Path, _FileState] = dict()
+
+        for path in self.watched_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            result[path] = _FileState(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+        return result